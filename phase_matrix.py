@@ -0,0 +1,194 @@
+# Cross-version performance matrix
+# The repo keeps every step of the game (phase_1 ... phase_12, then work), each one
+# adding features to the same main loop. This runs every version's unchanged
+# main.py headless for the same scripted frames and puts their costs side by side,
+# so it shows which step made a frame more expensive, took longer to start or
+# used more memory:
+#
+#   python phase_matrix.py
+#   python phase_matrix.py --frames 3000 --only phase_11 phase_12 work --json matrix.json
+#
+# Each version runs in its own Python process. They all have a game_objects.py,
+# so they can't share one interpreter, and the peak memory of a process is then
+# the version's alone. Inside that process the game's main.py runs as a script,
+# with pygame's window, sound, keyboard and frame limiter swapped for stand-ins:
+# - the SDL dummy video and audio drivers, so no window or sound card is needed
+# - pygame.event.get hands out scripted key presses: SPACE (start, launch, restart)
+#   every 30 frames and F (fire the laser) every 10
+# - pygame.key.get_pressed holds LEFT or RIGHT to keep the paddle under the ball
+#   (versions without a ball sweep the paddle from side to side), and SPACE
+# - clock.tick doesn't wait, and the game's clock moves on 1/60 s per frame, so
+#   every version runs exactly one game tick per frame as fast as it can
+# Startup time runs from the start of main.py (with pygame already imported) to
+# its first pygame.event.get call. A frame runs from one pygame.event.get call to
+# the next. Peak memory includes pygame and NumPy, which every process loads.
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+VERSIONS = [f"phase_{number}" for number in range(1, 13)] + ['work']
+# Extra command-line arguments for a version's main.py
+VERSION_ARGS = {'work': ['--seed', '0']}
+FPS = 60
+# Scripted presses, every this many frames
+SPACE_INTERVAL = 30
+FIRE_INTERVAL = 10
+
+class Finished(Exception):
+    """Raised from the patched pygame.event.get to stop the game's loop."""
+
+class ScriptedKeys:
+    """Stands in for pygame.key.get_pressed(): a lookup of which keys are held."""
+    def __init__(self, held):
+        self.held = held
+
+    def __getitem__(self, key):
+        return key in self.held
+
+def find_ball_and_paddle(game):
+    """Returns the game's (ball, paddle), from its globals or its GameSession."""
+    session = game.get('session')
+    if session is not None:
+        return session.ball, session.paddle
+    return game.get('ball'), game.get('paddle')
+
+def run_version(directory, frames, warmup):
+    """
+    Runs one version's main.py in this process for warmup + frames frames, and
+    returns its timings. Only to be used in a process of its own (see --child).
+    """
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    import random
+    import numpy as np
+    import pygame
+
+    clock = time.perf_counter
+    real_perf_counter = time.perf_counter
+    frame_starts = []
+    game = {'__name__': '__main__', '__file__': os.path.join(directory, 'main.py')}
+
+    def get_events():
+        frame_starts.append(clock())
+        frame = len(frame_starts)
+        if frame > warmup + frames:
+            raise Finished
+        pygame.event.pump()
+        events = []
+        if frame % SPACE_INTERVAL == 0:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, mod=0, unicode=' '))
+        if frame % FIRE_INTERVAL == 0:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_f, mod=0, unicode='f'))
+        return events
+
+    def get_pressed():
+        ball, paddle = find_ball_and_paddle(game)
+        held = {pygame.K_SPACE}
+        if paddle is None:
+            return ScriptedKeys(held)
+        if ball is None:
+            # Sweep from side to side, a second each way
+            held.add(pygame.K_LEFT if len(frame_starts) % (2 * FPS) < FPS else pygame.K_RIGHT)
+        elif ball.rect.centerx < paddle.rect.centerx - 10:
+            held.add(pygame.K_LEFT)
+        elif ball.rect.centerx > paddle.rect.centerx + 10:
+            held.add(pygame.K_RIGHT)
+        return ScriptedKeys(held)
+
+    def game_clock():
+        # The fixed-timestep versions see exactly one tick's worth of time per frame
+        return len(frame_starts) / FPS
+
+    pygame.event.get = get_events
+    pygame.key.get_pressed = get_pressed
+    pygame.time.Clock = lambda: type('Clock', (), {'tick': lambda self, framerate=0: 0})()
+    time.perf_counter = game_clock
+
+    os.chdir(directory)
+    sys.path.insert(0, directory)
+    sys.argv = [game['__file__']] + VERSION_ARGS.get(os.path.basename(directory), [])
+    random.seed(0)
+    with open(game['__file__']) as f:
+        code = compile(f.read(), game['__file__'], 'exec')
+
+    start = clock()
+    try:
+        exec(code, game)
+    except Finished:
+        pass
+    finally:
+        time.perf_counter = real_perf_counter
+
+    times = np.diff(frame_starts)[warmup:] * 1000 # Milliseconds
+    session = game.get('session')
+    return {
+        'frames': len(times),
+        # How far the scripted player got, to check that every version was really played
+        'score': session.score if session is not None else game.get('score'),
+        'startup_ms': (frame_starts[0] - start) * 1000,
+        'fps': float(1000 / times.mean()),
+        'mean_ms': float(times.mean()),
+        'p50_ms': float(np.percentile(times, 50)),
+        'p95_ms': float(np.percentile(times, 95)),
+        'p99_ms': float(np.percentile(times, 99)),
+        # Linux reports kilobytes, macOS bytes
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 ** 2 if sys.platform == 'darwin' else 1024),
+    }
+
+def measure(version, frames, warmup):
+    """Runs one version in a new Python process and returns its timings."""
+    with tempfile.TemporaryDirectory() as temp:
+        output = os.path.join(temp, 'result.json')
+        command = [sys.executable, os.path.abspath(__file__), '--child', version, output,
+                   '--frames', str(frames), '--warmup', str(warmup)]
+        completed = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"{version} failed:\n{completed.stderr}")
+        with open(output) as f:
+            return json.load(f)
+
+def report(results):
+    """Prints the versions as a table, with each one's frame cost next to the one before."""
+    print(f"{'version':<10}{'startup ms':>12}{'fps':>9}{'mean ms':>10}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'p99 ms':>9}{'vs prev':>9}{'peak MB':>9}{'score':>7}")
+    previous = None
+    for version, stats in results.items():
+        change = f"{(stats['mean_ms'] / previous - 1) * 100:+.0f}%" if previous else ''
+        print(f"{version:<10}{stats['startup_ms']:12.1f}{stats['fps']:9.0f}{stats['mean_ms']:10.3f}"
+              f"{stats['p50_ms']:9.3f}{stats['p95_ms']:9.3f}{stats['p99_ms']:9.3f}{change:>9}"
+              f"{stats['peak_rss_mb']:9.1f}{stats['score'] if stats['score'] is not None else '-':>7}")
+        previous = stats['mean_ms']
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the cost of every version of the game")
+    parser.add_argument('--frames', type=int, default=2000, help="Timed frames per version")
+    parser.add_argument('--warmup', type=int, default=100, help="Untimed frames before timing starts")
+    parser.add_argument('--only', nargs='+', choices=VERSIONS, metavar='VERSION', help="Only run these versions")
+    parser.add_argument('--json', metavar='FILE', help="Write the results to a JSON file")
+    parser.add_argument('--child', nargs=2, metavar=('VERSION', 'OUTPUT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        version, output = args.child
+        result = run_version(os.path.join(ROOT, version), args.frames, args.warmup)
+        with open(output, 'w') as f:
+            json.dump(result, f)
+        return
+
+    results = {}
+    for version in args.only or VERSIONS:
+        print(f"running {version}...", file=sys.stderr)
+        results[version] = measure(version, args.frames, args.warmup)
+    report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'frames': args.frames, 'versions': results}, f, indent=1)
+
+if __name__ == '__main__':
+    main()
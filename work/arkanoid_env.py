@@ -0,0 +1,150 @@
+# !!! NEW: Reinforcement-learning environment
+# Wraps a GameSession in the reset() / step(action) interface learning libraries
+# expect (the same shape as Gymnasium's Env, without depending on it):
+#
+#   env = ArkanoidEnv(observation='pixels')
+#   observation, info = env.reset(seed=1)
+#   while True:
+#       observation, reward, terminated, truncated, info = env.step(action)
+#
+# Observations are either a small feature vector (the ball, the paddle, which
+# bricks are left and the falling power-ups) or the rendered screen. Pixel
+# observations are views straight onto the surface the game was drawn on (see
+# pygame.surfarray.pixels3d), so no pixels are copied on any step.
+import numpy as np
+import pygame
+from game_session import GameSession, FrameInput, POWER_UP_TYPES, init_headless
+from renderer import Renderer
+from brick_grid import level_bitmaps
+from levels import MAX_LEVELS
+
+# The actions an agent can take, as the controls held / pressed for the step
+ACTIONS = (
+    FrameInput(),                                # 0: nothing
+    FrameInput(left=True),                       # 1: left
+    FrameInput(right=True),                      # 2: right
+    FrameInput(space=True),                      # 3: fire / launch
+    FrameInput(left=True, space=True),           # 4: left and fire
+    FrameInput(right=True, space=True),          # 5: right and fire
+)
+
+# How many falling power-ups the feature vector has room for (nearest to the paddle first)
+MAX_POWER_UPS = 4
+# Reward taken off for each life lost. The game itself has no score penalty for it.
+LIFE_PENALTY = 100
+
+class ArkanoidEnv:
+    def __init__(self, observation='features', frame_skip=1, max_steps=None, life_penalty=LIFE_PENALTY,
+                 screen_width=800, screen_height=600, max_levels=MAX_LEVELS):
+        """
+        - observation: 'features' for a float32 feature vector, or 'pixels' for the
+          rendered screen as a (width, height, 3) uint8 array.
+        - frame_skip: How many game ticks each step runs with the same action.
+        - max_steps: Episodes are cut off (truncated) after this many steps.
+        - life_penalty: Subtracted from the reward for every life lost.
+        """
+        if observation not in ('features', 'pixels'):
+            raise ValueError(f"Unknown observation type {observation!r}")
+        init_headless()
+        self.observation_type = observation
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.life_penalty = life_penalty
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.max_levels = max_levels
+        self.action_count = len(ACTIONS)
+        self.brick_rows, self.brick_cols = level_bitmaps(max_levels).shape[1:]
+
+        self.renderer = None
+        if observation == 'pixels':
+            # Two surfaces drawn on in turn. pixels3d locks the surface it looks at
+            # for as long as the array exists, and a locked surface can't be blitted
+            # onto. Drawing into the other surface leaves the previous observation
+            # (which the caller usually still holds during step()) untouched.
+            self.surfaces = [pygame.Surface((screen_width, screen_height)) for _ in range(2)]
+            self.current_surface = 0
+            self.renderer = Renderer(self.surfaces[0])
+            self.observation_shape = (screen_width, screen_height, 3)
+        else:
+            self.observation_shape = (8 + self.brick_rows * self.brick_cols + 3 * MAX_POWER_UPS,)
+        self.session = None
+
+    def reset(self, seed=None):
+        """
+        Starts a new game (already past the title screen).
+        Returns (observation, info).
+        """
+        self.session = GameSession(self.screen_width, self.screen_height, self.max_levels, seed=seed)
+        self.session.step(FrameInput(space=True))
+        self.steps = 0
+        return self._observe(), self._info()
+
+    def step(self, action):
+        """
+        Runs frame_skip ticks with one of the ACTIONS (given by its index).
+        Returns (observation, reward, terminated, truncated, info): terminated is
+        True once the game is lost or won, truncated once max_steps is reached.
+        """
+        session = self.session
+        inputs = ACTIONS[action]
+        score = session.score
+        lives = session.lives
+        for _ in range(self.frame_skip):
+            session.step(inputs)
+            if session.game_state != 'playing':
+                break
+        self.steps += 1
+        reward = session.score - score - self.life_penalty * (lives - session.lives)
+        terminated = session.game_state != 'playing'
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        return self._observe(), reward, terminated, truncated, self._info()
+
+    def _info(self):
+        session = self.session
+        return {'score': session.score, 'lives': session.lives, 'level': session.current_level,
+                'frame': session.frame, 'seed': session.seed}
+
+    def _observe(self):
+        if self.renderer is not None:
+            return self._observe_pixels()
+        return self._observe_features()
+
+    def _observe_pixels(self):
+        """Draws the game and returns a view of the pixels (valid until the step after next)."""
+        self.current_surface = 1 - self.current_surface
+        surface = self.surfaces[self.current_surface]
+        if surface.get_locked():
+            raise RuntimeError("A pixel observation from two steps ago is still in use; "
+                               "copy observations you want to keep (e.g. with numpy.array)")
+        self.renderer.screen = surface
+        self.renderer.draw(self.session)
+        return pygame.surfarray.pixels3d(surface)
+
+    def _observe_features(self):
+        """
+        Returns the feature vector, with positions scaled to 0-1 by the screen size:
+        ball x, y, x speed, y speed (in units of the ball's base speed), paddle x,
+        width, ball glued and laser active (0 or 1), one 0/1 per brick cell, then
+        x, y and type (0-1) of up to MAX_POWER_UPS falling power-ups.
+        """
+        session = self.session
+        ball = session.ball
+        paddle = session.paddle
+        width = self.screen_width
+        height = self.screen_height
+        features = np.zeros(self.observation_shape, dtype=np.float32)
+        features[:8] = (ball.rect.centerx / width, ball.rect.centery / height,
+                        ball.speed_x / ball.base_speed, ball.speed_y / ball.base_speed,
+                        paddle.rect.centerx / width, paddle.rect.width / width,
+                        ball.is_glued, paddle.has_laser)
+        bricks = features[8:8 + self.brick_rows * self.brick_cols].reshape(self.brick_rows, self.brick_cols)
+        hits = session.bricks.arrays()[1][:self.brick_rows, :self.brick_cols]
+        bricks[:hits.shape[0], :hits.shape[1]] = hits > 0
+        # The lowest power-ups are the ones about to reach the paddle
+        power_ups = sorted(session.power_ups, key=lambda power_up: -power_up.rect.y)[:MAX_POWER_UPS]
+        slots = features[8 + bricks.size:].reshape(MAX_POWER_UPS, 3)
+        for slot, power_up in zip(slots, power_ups):
+            slot[:] = (power_up.rect.centerx / width, power_up.rect.centery / height,
+                       (POWER_UP_TYPES.index(power_up.type) + 1) / len(POWER_UP_TYPES))
+        return features
@@ -0,0 +1,234 @@
+# !!! NEW: Vectorized lockstep simulator for many games at once
+# GameSession steps one game with plain Python objects, which is the right thing
+# for playing but far too slow for balancing runs or bot training that need
+# millions of frames. BatchSimulator keeps N independent games in NumPy arrays
+# instead - one entry per game for the ball, the paddle, the score and so on, and
+# one brick bitmap per game - and steps all of them together with whole-array
+# operations, so a frame costs about the same for 1 game as for hundreds.
+#
+# The rules are the same as GameSession's (Paddle.update, Ball.update, the brick
+# check in _collide_ball_with_bricks, losing lives and advancing levels), for the
+# classic game without power-ups: it plays exactly like
+# GameSession(power_up_chance=0) that starts out already playing. The random ball
+# directions come from NumPy instead of the session's RNG.
+#
+#   python batch_sim.py --games 512 --frames 5000
+import time
+import argparse
+import numpy as np
+from game_objects import Paddle, Ball
+from levels import MAX_LEVELS, BRICK_WIDTH, BRICK_HEIGHT
+from brick_grid import CELL_WIDTH, CELL_HEIGHT, GRID_LEFT, GRID_TOP, level_bitmaps
+
+# What each game is doing
+PLAYING = 0
+GAME_OVER = 1
+YOU_WIN = 2
+
+class BatchSimulator:
+    def __init__(self, count, screen_width=800, screen_height=600, max_levels=MAX_LEVELS, seed=None):
+        """
+        Creates `count` games, all at the start of level 1 and already playing.
+        - screen_width, screen_height, max_levels: As for GameSession.
+        - seed: Seeds the random ball directions of every game.
+        """
+        self.count = count
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.max_levels = max_levels
+        self.rng = np.random.default_rng(seed)
+
+        # The sizes and speeds come from the real game objects, so they can't drift apart
+        paddle = Paddle(screen_width, screen_height)
+        ball = Ball(screen_width, screen_height)
+        self.paddle_y = paddle.rect.y
+        self.paddle_height = paddle.height
+        self.paddle_speed = paddle.speed
+        self.paddle_original_width = paddle.original_width
+        self.ball_size = ball.rect.width
+        self.ball_speed = ball.base_speed
+
+        self.level_bricks = level_bitmaps(max_levels)
+        _, rows, cols = self.level_bricks.shape
+        # Every (row, col) cell offset the ball can cover from the cell its top-left
+        # corner is in, in the order BrickGrid.colliding checks them
+        row_span = (self.ball_size - 1) // CELL_HEIGHT + 2
+        col_span = (self.ball_size - 1) // CELL_WIDTH + 2
+        self.cell_offsets = [(row, col) for row in range(row_span) for col in range(col_span)]
+
+        # One entry per game
+        self.paddle_x = np.zeros(count, dtype=np.int32)
+        self.paddle_width = np.zeros(count, dtype=np.int32)
+        self.ball_x = np.zeros(count, dtype=np.int32)
+        self.ball_y = np.zeros(count, dtype=np.int32)
+        self.ball_vx = np.zeros(count, dtype=np.int32)
+        self.ball_vy = np.zeros(count, dtype=np.int32)
+        self.score = np.zeros(count, dtype=np.int64)
+        self.lives = np.zeros(count, dtype=np.int32)
+        self.level = np.zeros(count, dtype=np.int32)
+        self.state = np.zeros(count, dtype=np.int8)
+        # Which cells still have a brick, and how many
+        self.bricks = np.zeros((count, rows, cols), dtype=bool)
+        self.bricks_left = np.zeros(count, dtype=np.int32)
+        self.frame = 0
+        self.reset()
+
+    def reset(self, games=None):
+        """
+        Starts games over from level 1.
+        - games: A boolean mask or index array of the games to restart (all if left out).
+        """
+        if games is None:
+            games = np.ones(self.count, dtype=bool)
+        self.score[games] = 0
+        self.lives[games] = 3
+        self.level[games] = 1
+        self.state[games] = PLAYING
+        self.paddle_width[games] = self.paddle_original_width
+        self._start_level(games)
+
+    def _start_level(self, games):
+        """Lays out the wall of each game's current level and resets its ball and paddle."""
+        self.bricks[games] = self.level_bricks[self.level[games] - 1]
+        self.bricks_left[games] = self.bricks[games].sum(axis=(1, 2))
+        self._reset_ball(games)
+        self._reset_paddle(games)
+
+    def _reset_ball(self, games):
+        """Ball.reset: back to the center, moving up and randomly left or right."""
+        size = self.ball_size
+        self.ball_x[games] = self.screen_width // 2 - size // 2
+        self.ball_y[games] = self.screen_height // 2 - size // 2
+        count = len(self.ball_x[games])
+        self.ball_vx[games] = np.where(self.rng.random(count) < 0.5, self.ball_speed, -self.ball_speed)
+        self.ball_vy[games] = -self.ball_speed
+
+    def _reset_paddle(self, games):
+        """Paddle.reset: back to the middle (centered for its width before the reset)."""
+        self.paddle_x[games] = self.screen_width // 2 - self.paddle_width[games] // 2
+        self.paddle_width[games] = self.paddle_original_width
+
+    @property
+    def done(self):
+        """A boolean array of the games that are over (lost or won)."""
+        return self.state != PLAYING
+
+    def step(self, left, right):
+        """
+        Advances every game that is still playing by one tick.
+        - left, right: Boolean arrays with each game's arrow keys for this tick.
+        Returns a boolean array of the games that lost a life this tick.
+        """
+        self.frame += 1
+        active = self.state == PLAYING
+        width = self.screen_width
+        size = self.ball_size
+
+        # Paddle.update: move, then stay on the screen
+        move = (np.asarray(right, dtype=np.int32) - np.asarray(left, dtype=np.int32)) * self.paddle_speed
+        paddle_x = np.where(active, self.paddle_x + move, self.paddle_x)
+        np.clip(paddle_x, 0, width - self.paddle_width, out=paddle_x)
+        self.paddle_x = paddle_x
+        paddle_right = paddle_x + self.paddle_width
+
+        # Ball.update: move, then bounce off the walls and the paddle
+        ball_x = np.where(active, self.ball_x + self.ball_vx, self.ball_x)
+        ball_y = np.where(active, self.ball_y + self.ball_vy, self.ball_y)
+        vx = self.ball_vx
+        vy = self.ball_vy
+        vy[active & (ball_y <= 0)] *= -1
+        vx[active & ((ball_x <= 0) | (ball_x + size >= width))] *= -1
+        # Only when coming down onto the paddle, as in Ball.update
+        on_paddle = (active & (vy > 0) & (ball_x < paddle_right) & (ball_x + size > paddle_x)
+                     & (ball_y < self.paddle_y + self.paddle_height) & (ball_y + size > self.paddle_y))
+        vy[on_paddle] *= -1
+        self.ball_x = ball_x
+        self.ball_y = ball_y
+
+        # Losing a life
+        lost = active & (ball_y > self.screen_height)
+        self.lives -= lost
+        over = lost & (self.lives <= 0)
+        self.state[over] = GAME_OVER
+        restart = lost & ~over
+        if restart.any():
+            self._reset_ball(restart)
+            self._reset_paddle(restart)
+
+        self._collide_with_bricks(active)
+
+        # Level progression: cleared walls move on to the next level, or win the game
+        cleared = active & (self.bricks_left == 0)
+        if cleared.any():
+            advance = cleared & (self.level < self.max_levels)
+            self.level[advance] += 1
+            self.score[advance] += 100 * self.level[advance]
+            self._start_level(advance)
+            self.state[cleared & ~advance] = YOU_WIN
+        return lost
+
+    def _collide_with_bricks(self, active):
+        """
+        The ball breaks the first brick it overlaps (top row first, then left to
+        right, like BrickGrid.first_colliding) and bounces back vertically.
+        """
+        size = self.ball_size
+        ball_x = self.ball_x
+        ball_y = self.ball_y
+        bricks = self.bricks
+        _, rows, cols = bricks.shape
+        games = np.arange(self.count)
+        first_row = (ball_y - GRID_TOP) // CELL_HEIGHT
+        first_col = (ball_x - GRID_LEFT) // CELL_WIDTH
+        hit = np.zeros(self.count, dtype=bool)
+        hit_row = np.zeros(self.count, dtype=np.intp)
+        hit_col = np.zeros(self.count, dtype=np.intp)
+
+        for row_offset, col_offset in self.cell_offsets:
+            row = first_row + row_offset
+            col = first_col + col_offset
+            inside = (row >= 0) & (row < rows) & (col >= 0) & (col < cols)
+            safe_row = np.where(inside, row, 0)
+            safe_col = np.where(inside, col, 0)
+            brick_left = GRID_LEFT + col * CELL_WIDTH
+            brick_top = GRID_TOP + row * CELL_HEIGHT
+            # The cell also covers the padding around its brick, so check the brick itself
+            touching = (inside & ~hit & bricks[games, safe_row, safe_col]
+                        & (ball_x < brick_left + BRICK_WIDTH) & (ball_x + size > brick_left)
+                        & (ball_y < brick_top + BRICK_HEIGHT) & (ball_y + size > brick_top))
+            hit_row[touching] = row[touching]
+            hit_col[touching] = col[touching]
+            hit |= touching
+
+        hit &= active
+        if hit.any():
+            bricks[games[hit], hit_row[hit], hit_col[hit]] = False
+            self.bricks_left -= hit
+            self.ball_vy[hit] *= -1
+            self.score += 10 * hit
+
+def track_ball(sim, dead_zone=10):
+    """A simple policy for every game at once: keep the paddle under the ball."""
+    ball_center = sim.ball_x + sim.ball_size // 2
+    paddle_center = sim.paddle_x + sim.paddle_width // 2
+    return ball_center < paddle_center - dead_zone, ball_center > paddle_center + dead_zone
+
+def main():
+    parser = argparse.ArgumentParser(description="Step many games at once with a ball-tracking paddle")
+    parser.add_argument('--games', type=int, default=512, help="How many games to run side by side")
+    parser.add_argument('--frames', type=int, default=5000, help="How many ticks to run them for")
+    parser.add_argument('--seed', type=int, help="Seed for the ball directions")
+    args = parser.parse_args()
+
+    sim = BatchSimulator(args.games, seed=args.seed)
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        sim.step(*track_ball(sim))
+    elapsed = time.perf_counter() - start
+    game_frames = args.games * args.frames
+    print(f"{game_frames} game frames in {elapsed:.2f}s ({game_frames / elapsed:,.0f} game frames/s)")
+    print(f"score: mean {sim.score.mean():.0f}, max {sim.score.max()}; level: mean {sim.level.mean():.2f}; "
+          f"lost {np.count_nonzero(sim.state == GAME_OVER)}, won {np.count_nonzero(sim.state == YOU_WIN)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# !!! NEW: Object pool stress benchmark
+# Runs the same laser-and-power-up-heavy game (same seed, same inputs) twice, once
+# with object pooling and once without, and shows how many objects each run allocates per frame and how
+# long a frame took.
+#
+#   python bench_pools.py --frames 20000
+import time
+import argparse
+from game_session import GameSession, FrameInput, POWER_UP_TYPES
+from brick_grid import BrickGrid
+
+def run(pooling, frames, seed):
+    """
+    Plays `frames` frames of non-stop laser fire and power-up rain. Returns a result dict.
+    - seed: The session's seed. Both runs use the same one, so they play the same game.
+    """
+    session = GameSession(pooling=pooling, seed=seed)
+    session.step(FrameInput(space=True)) # Leave the title screen
+    session.lives = 10 ** 9 # Never run out of lives
+    paddle = session.paddle
+    start = time.perf_counter()
+
+    for frame in range(frames):
+        # Keep the laser on and fire every other frame
+        if not paddle.has_laser:
+            paddle.activate_power_up('laser', 600)
+        inputs = FrameInput(left=frame % 120 < 60, right=frame % 120 >= 60, space=frame % 2 == 0)
+        # A power-up falls from somewhere above the paddle every few frames
+        if frame % 3 == 0:
+            session.drop_power_up(frame * 37 % 770, 200, POWER_UP_TYPES[frame % len(POWER_UP_TYPES)])
+        session.step(inputs)
+        # Keep the wall topped up so the game never advances a level
+        if len(session.bricks) < 10:
+            session.bricks = BrickGrid.for_level(1)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'pooling': pooling,
+        'ms_per_frame': elapsed * 1000 / frames,
+        'pools': session.pool_stats(),
+    }
+
+def report(result, frames):
+    """Prints one run's results."""
+    print(f"pooling={'on' if result['pooling'] else 'off'}: {result['ms_per_frame']:.3f} ms/frame")
+    for stats in result['pools']:
+        print(f"  {stats['type']:>8}: {stats['created'] / frames:8.4f} allocations/frame "
+              f"({stats['created']} in total), peak in use {stats['peak_in_use']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Object pool stress benchmark")
+    parser.add_argument('--frames', type=int, default=10000, help="Frames to run for each configuration")
+    parser.add_argument('--seed', type=int, default=1, help="The seed both configurations play")
+    args = parser.parse_args()
+    for pooling in (False, True):
+        report(run(pooling, args.frames, args.seed), args.frames)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+# !!! NEW: Benchmark suite
+# Times the game's hot paths in repeatable, seeded scenarios: stepping each level
+# layout with the autopilot, a storm of brick-break particles, the fireworks on
+# the victory screen, non-stop laser fire, drawing a screen full of power-up
+# capsules, the frame on which one level ends and the next begins, and a couple
+# of hundred balls of multi-ball (with and without balls bouncing off each other).
+# For each scenario it records how long every frame took and reports frames per
+# second and the spread of frame times (median, 95th and 99th percentiles).
+#
+# Results can be saved as JSON and compared against a stored baseline, so a change
+# can be checked for slowdowns before it goes in:
+#
+#   python benchmark.py --save-baseline              # once, on the reference machine
+#   python benchmark.py                              # after a change: PASS or FAIL
+#   python benchmark.py --only laser_fire --output results.json
+#
+# The exit code is 1 if any scenario got slower than the baseline by more than
+# the tolerance.
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import numpy as np
+import pygame
+from game_session import GameSession, FrameInput, POWER_UP_TYPES, init_headless
+from renderer import Renderer
+from bots import AutopilotBot
+from brick_grid import BrickGrid
+from levels import MAX_LEVELS
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# The frame-time statistics compared against the baseline. The tail percentiles
+# are reported too, but they jump around with whatever else the machine is doing.
+COMPARED = ('p50_ms',)
+# Slowdowns smaller than this many milliseconds are timer noise, however large in percent
+MIN_SLOWDOWN_MS = 0.05
+
+def play_level(session, level):
+    """Puts the session at the start of `level`, playing."""
+    session.current_level = level
+    session.bricks = BrickGrid.for_level(level)
+    session.ball.reset()
+    session.paddle.reset()
+    session.game_state = 'playing'
+
+def bench_level(level):
+    """The autopilot plays the level over and over (one tick per frame)."""
+    session = GameSession(seed=level)
+    session.lives = 10 ** 9 # Never run out of lives
+    bot = AutopilotBot(session, level)
+    play_level(session, level)
+
+    def frame():
+        session.step(bot.next_frame())
+        # Start the level again instead of moving on once it is cleared
+        if session.current_level != level:
+            play_level(session, level)
+    return frame
+
+def bench_particle_storm(renderer):
+    """Ten bricks' worth of particles burst every frame; step and draw."""
+    session = GameSession(seed=1)
+    play_level(session, 1)
+    session.ball.is_glued = True # Keep the ball out of the way
+    grid = session.bricks
+    bricks = [(*grid.rect(brick).center, grid.color(brick)) for brick in grid]
+    rng = np.random.default_rng(1)
+
+    def frame():
+        for index in rng.integers(0, len(bricks), 10):
+            x, y, color = bricks[index]
+            session.particles.emit(x, y, color, 15, 1, 4, 1, 4, 0.05)
+        session.step()
+        renderer.draw(session)
+    return frame
+
+def bench_fireworks(renderer):
+    """The victory screen with its fireworks; step and draw."""
+    session = GameSession(seed=1)
+    session.game_state = 'you_win'
+
+    def frame():
+        session.step()
+        # The fireworks are launched by the tick that wins the game, so launch them here
+        if session.effects_rng.random() < 0.3:
+            session.fireworks.append(session.make_firework())
+        renderer.draw(session)
+    return frame
+
+def bench_laser_fire():
+    """The laser is always on and fires every other frame while the wall refills."""
+    session = GameSession(seed=1)
+    play_level(session, 1)
+    session.lives = 10 ** 9
+    paddle = session.paddle
+    count = 0
+
+    def frame():
+        nonlocal count
+        count += 1
+        if not paddle.has_laser:
+            paddle.activate_power_up('laser', 600)
+        session.step(FrameInput(left=count % 120 < 60, right=count % 120 >= 60, space=count % 2 == 0))
+        if len(session.bricks) < 10:
+            play_level(session, 1)
+    return frame
+
+def bench_draw_power_ups(renderer):
+    """A full draw pass of a playing screen with 100 power-up capsules on it."""
+    session = GameSession(seed=1)
+    play_level(session, 1)
+    for i in range(100):
+        session.drop_power_up(i * 73 % 770, 200 + i * 29 % 300, POWER_UP_TYPES[i % len(POWER_UP_TYPES)])
+
+    def frame():
+        renderer.draw(session)
+    return frame
+
+def handle_events(events):
+    """
+    Stands in for main.py's handling of a tick's events. Each event that plays a
+    sound there lets other threads run, as Sound.play does, so work on the level
+    thread can get in between a step and the frame's drawing the way it does in the
+    game.
+    """
+    for event in events:
+        if event in ('bounce', 'brick_break', 'brick_hit', 'life_lost', 'laser'):
+            time.sleep(0)
+
+def bench_level_up(renderer):
+    """
+    Every frame the ball breaks the last brick of the wall, so the step moves on to
+    the next (generated) level. The frame then handles the step's events and draws
+    the new level, in the order main.py does. Between frames the other bricks are cleared away and
+    the next level is prepared in the background, as it would be while the level
+    is played.
+    """
+    session = GameSession(seed=1, endless=True)
+    session.level_listeners.append(renderer.prepare_layer)
+    play_level(session, 1)
+    ball = session.ball
+
+    def frame():
+        # The ball, just under the last brick and heading up into it
+        bricks = session.bricks
+        brick = next(iter(bricks))
+        bricks.hits[brick] = 1
+        rect = bricks.rect(brick)
+        ball.is_glued = False
+        ball.rect.midtop = (rect.centerx, rect.bottom + 1)
+        ball.speed_y = -abs(ball.speed_y)
+        handle_events(session.step())
+        renderer.draw(session)
+
+    def between():
+        # The next tick starts preparing the next level
+        session.step()
+        bricks = session.bricks
+        for brick in list(bricks)[1:]:
+            bricks.remove(brick)
+        session.next_level[1].result()
+    between()
+    return frame, between
+
+def bench_multi_ball(renderer, collide):
+    """
+    Multi-ball with about 250 balls (split again whenever fewer than 200 are left);
+    step and draw. The wall is level 1 with bricks that take 255 hits, topped up
+    between frames, so the balls keep bouncing off bricks without breaking them
+    (breaking a few hundred bricks a second would time the power-ups and particles).
+    """
+    session = GameSession(seed=1, ball_collisions=collide)
+    play_level(session, 1)
+    colors, hits = session.bricks.arrays()
+    session.bricks = BrickGrid(colors, np.where(hits > 0, 255, 0), session.bricks.palette)
+    session.lives = 10 ** 9
+
+    def frame():
+        while len(session.extra_balls) < 200:
+            session.extra_balls.split(session.ball)
+        session.step()
+        renderer.draw(session)
+
+    def between():
+        hits = session.bricks.arrays()[1]
+        hits[hits > 0] = 255
+    return frame, between
+
+def scenarios(renderer):
+    """
+    Returns {name: a function that sets the scenario up and returns its frame
+    function, or (frame function, a function to run untimed between frames)}.
+    """
+    result = {f"level_{level}": (lambda level=level: bench_level(level)) for level in range(1, MAX_LEVELS + 1)}
+    result['particle_storm'] = lambda: bench_particle_storm(renderer)
+    result['fireworks'] = lambda: bench_fireworks(renderer)
+    result['laser_fire'] = bench_laser_fire
+    result['draw_power_ups'] = lambda: bench_draw_power_ups(renderer)
+    result['level_up'] = lambda: bench_level_up(renderer)
+    result['multi_ball'] = lambda: bench_multi_ball(renderer, False)
+    result['multi_ball_collide'] = lambda: bench_multi_ball(renderer, True)
+    return result
+
+def measure(frame, frames, warmup, between=None):
+    """
+    Runs `frame` warmup + frames times. Returns the statistics of the timed frames.
+    - between: Called after every frame, outside the timing.
+    """
+    for _ in range(warmup):
+        frame()
+        if between is not None:
+            between()
+    clock = time.perf_counter_ns
+    times = np.empty(frames, dtype=np.float64)
+    for i in range(frames):
+        start = clock()
+        frame()
+        times[i] = clock() - start
+        if between is not None:
+            between()
+    times /= 1e6 # Milliseconds
+    return {
+        'frames': frames,
+        'fps': float(1000 / times.mean()),
+        'mean_ms': float(times.mean()),
+        'p50_ms': float(np.percentile(times, 50)),
+        'p95_ms': float(np.percentile(times, 95)),
+        'p99_ms': float(np.percentile(times, 99)),
+        'max_ms': float(times.max()),
+    }
+
+def compare(results, baseline, tolerance, min_slowdown=MIN_SLOWDOWN_MS):
+    """
+    Compares results with a baseline. Returns a list of (scenario, statistic,
+    baseline value, new value) for everything that got slower than allowed: by
+    more than `tolerance` (a fraction) and by more than `min_slowdown` milliseconds.
+    """
+    regressions = []
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        for key in COMPARED:
+            old = baseline[name][key]
+            if stats[key] > old * (1 + tolerance) and stats[key] - old > min_slowdown:
+                regressions.append((name, key, old, stats[key]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game's simulation and rendering hot paths")
+    parser.add_argument('--frames', type=int, default=2000, help="Timed frames per scenario")
+    parser.add_argument('--warmup', type=int, default=200, help="Untimed frames before timing starts")
+    parser.add_argument('--only', nargs='+', metavar='SCENARIO', help="Only run these scenarios")
+    parser.add_argument('--output', metavar='FILE', help="Write the results to a JSON file")
+    parser.add_argument('--baseline', metavar='FILE', default=DEFAULT_BASELINE, help="The baseline to compare with")
+    parser.add_argument('--save-baseline', action='store_true', help="Store the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="How much slower than the baseline is allowed (0.2 = 20%%)")
+    parser.add_argument('--min-slowdown', type=float, default=MIN_SLOWDOWN_MS,
+                        help="Ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args()
+
+    init_headless()
+    renderer = Renderer(pygame.Surface((800, 600)))
+    available = scenarios(renderer)
+    names = args.only or list(available)
+    for name in names:
+        if name not in available:
+            parser.error(f"unknown scenario {name!r} (choose from {', '.join(available)})")
+
+    results = {}
+    print(f"{'scenario':<16}{'fps':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name in names:
+        scenario = available[name]()
+        frame, between = scenario if isinstance(scenario, tuple) else (scenario, None)
+        stats = measure(frame, args.frames, args.warmup, between)
+        results[name] = stats
+        print(f"{name:<16}{stats['fps']:10.0f}{stats['mean_ms']:10.3f}{stats['p50_ms']:10.3f}"
+              f"{stats['p95_ms']:10.3f}{stats['p99_ms']:10.3f}")
+
+    report = {
+        'machine': platform.platform(),
+        'python': platform.python_version(),
+        'frames': args.frames,
+        'scenarios': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=1)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline['scenarios'], args.tolerance, args.min_slowdown)
+    for name, key, old, new in regressions:
+        print(f"REGRESSION {name} {key}: {old:.3f} -> {new:.3f} ms (+{(new / old - 1) * 100:.0f}%)")
+    if regressions:
+        print(f"FAIL: {len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        sys.exit(1)
+    print(f"PASS: no scenario is more than {args.tolerance:.0%} slower than the baseline")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# !!! NEW: Computer players
+# A bot is an input source (like KeyboardInput in inputs.py) that decides each
+# tick's controls by looking at the session it plays. Bots can drive the windowed
+# game (main.py --bot), replays, or thousands of headless games (tournament.py).
+import random
+from game_session import FrameInput, NO_INPUT
+
+class Bot:
+    """The base for bots: started with the session to play, ignores the keyboard."""
+    def __init__(self, session, seed=None):
+        """
+        - session: The GameSession the bot plays.
+        - seed: Seeds the bot's own randomness, if it has any.
+        """
+        self.session = session
+        self.rng = random.Random(seed)
+
+    def handle_event(self, event):
+        pass
+
+    def next_frame(self):
+        """Returns the input for the next game tick."""
+        return NO_INPUT
+
+class IdleBot(Bot):
+    """Starts the game and launches the ball, and never moves. A baseline."""
+    def next_frame(self):
+        return FrameInput(space=self.session.game_state == 'title_screen' or self.session.ball.is_glued)
+
+class RandomBot(Bot):
+    """Holds a random direction for a random while, and mashes SPACE now and then."""
+    def __init__(self, session, seed=None):
+        super().__init__(session, seed)
+        self.direction = 0
+        self.hold = 0
+
+    def next_frame(self):
+        if self.hold <= 0:
+            self.direction = self.rng.choice((-1, 0, 1))
+            self.hold = self.rng.randint(5, 40)
+        self.hold -= 1
+        return FrameInput(self.direction < 0, self.direction > 0, self.rng.random() < 0.05)
+
+class TrackingBot(Bot):
+    """Keeps the middle of the paddle under the ball, and launches / fires whenever it can."""
+    # How far off-center the ball may be before the paddle moves, in pixels
+    dead_zone = 10
+
+    def next_frame(self):
+        session = self.session
+        ball_x = session.ball.rect.centerx
+        paddle_x = session.paddle.rect.centerx
+        space = (session.game_state == 'title_screen' or session.ball.is_glued
+                 or (session.paddle.has_laser and session.frame % 10 == 0))
+        return FrameInput(ball_x < paddle_x - self.dead_zone, ball_x > paddle_x + self.dead_zone, space)
+
+def reflect(position, low, high):
+    """
+    Folds a position that went past `low` or `high` back inside, the way a ball
+    bouncing between two walls would be.
+    """
+    span = high - low
+    if span <= 0:
+        return low
+    offset = (position - low) % (2 * span)
+    return low + (offset if offset <= span else 2 * span - offset)
+
+class AutopilotBot(Bot):
+    """
+    Works out where the ball will come down (bouncing off the side walls and the
+    top on the way) and moves the paddle there. Launches a glued ball, fires
+    lasers whenever it has them, and starts a new game when one ends, so it can
+    be left playing on its own for as long as needed.
+    """
+    # Fire a laser pair every this many ticks while the laser is on
+    fire_interval = 8
+
+    def __init__(self, session, seed=None):
+        super().__init__(session, seed)
+        # Set to False to leave the game over / victory screen alone
+        self.restart = True
+
+    def predict_landing(self):
+        """Returns the x the ball's center will be at when it gets down to the paddle."""
+        session = self.session
+        ball = session.ball.rect
+        speed_x = session.ball.speed_x
+        speed_y = session.ball.speed_y
+        # The ball's top-left corner has to reach this height to touch the paddle
+        landing_y = session.paddle.rect.top - ball.height
+        if speed_y > 0:
+            distance = landing_y - ball.y
+        elif speed_y < 0:
+            # Up to the top wall first, then all the way down
+            distance = ball.y + landing_y
+        else:
+            return ball.centerx
+        ticks = max(distance, 0) / abs(speed_y)
+        left = reflect(ball.x + speed_x * ticks, 0, session.screen_width - ball.width)
+        return left + ball.width / 2
+
+    def next_frame(self):
+        session = self.session
+        if session.game_state != 'playing':
+            # Start the game, or go back to the title screen and then start again
+            return FrameInput(space=session.game_state == 'title_screen' or self.restart)
+        paddle = session.paddle
+        ball = session.ball
+        if ball.is_glued:
+            return FrameInput(space=True)
+        target = self.predict_landing()
+        # Within one move of the target is close enough, or the paddle would jitter
+        dead_zone = paddle.speed / 2
+        fire = paddle.has_laser and session.frame % self.fire_interval == 0
+        return FrameInput(target < paddle.rect.centerx - dead_zone, target > paddle.rect.centerx + dead_zone, fire)
+
+# The bots by name, for command-line options
+BOTS = {
+    'idle': IdleBot,
+    'random': RandomBot,
+    'tracking': TrackingBot,
+    'autopilot': AutopilotBot,
+}
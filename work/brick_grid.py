@@ -0,0 +1,187 @@
+import numpy as np
+import pygame
+from levels import BRICK_WIDTH, BRICK_HEIGHT, BRICK_PADDING, WALL_START_Y, LEVEL_PACK, MAX_LEVELS
+
+# !!! NEW: Uniform-grid spatial index for the brick wall
+# Every level places its bricks on the same regular grid: one brick per
+# 80x25 cell (a 75x20 brick plus its 5px padding). So instead of testing a ball or a
+# laser against every brick, we can work out which few cells it overlaps with simple
+# arithmetic and only test the bricks in those cells.
+#
+# !!! NEW: The wall as a bitmap
+# Since every brick sits in a cell and has the same size, a brick doesn't need to
+# be an object with its own Rect at all. The grid keeps two bytes per cell, in two
+# flat bytearrays: how many hits the brick there still takes (0 for no brick) and
+# its color, as an index into the level's palette. A brick is named by its cell
+# number (row * cols + col), its ID. Its rect and color are worked out when they
+# are needed, breaking it is two byte writes, and the count of bricks left is kept
+# as they break. A whole wall is a couple of hundred bytes that are cheap to copy,
+# hash, snapshot or send to another process, and arrays() gives NumPy views of it.
+
+CELL_WIDTH = BRICK_WIDTH + BRICK_PADDING
+CELL_HEIGHT = BRICK_HEIGHT + BRICK_PADDING
+GRID_LEFT = BRICK_PADDING
+GRID_TOP = WALL_START_Y
+
+# !!! NEW: The game's levels as plain bitmaps, for code that only needs to know where
+# the bricks are (batch_sim.py, arkanoid_env.py)
+def level_bitmaps(max_levels=MAX_LEVELS):
+    """
+    Returns a (max_levels, rows, cols) array of booleans: which grid cells have a
+    brick at the start of each level (level 1 first). Bricks that take several
+    hits count as ordinary bricks here.
+    """
+    return LEVEL_PACK.hits[:max_levels] > 0
+
+class BrickGrid:
+    def __init__(self, colors, hits, palette):
+        """
+        Holds the bricks of a level (copies of the arrays given).
+        - colors: A (rows, cols) array with each cell's index into `palette`.
+        - hits: A (rows, cols) array with how many hits each cell's brick takes to
+          break (0 for no brick).
+        - palette: The colors as (red, green, blue), with None for index 0 (like
+          LevelPack.palette).
+        Iterating over the grid gives the IDs of the bricks left, top row first and
+        left to right within a row.
+        """
+        hits = np.asarray(hits, dtype=np.uint8)
+        colors = np.where(hits > 0, np.asarray(colors, dtype=np.uint8), 0).astype(np.uint8)
+        self.rows, self.cols = hits.shape
+        self.hits = bytearray(hits.tobytes())
+        self.colors = bytearray(colors.tobytes())
+        self.palette = list(palette)
+        # How many bricks are left
+        self.count = int(np.count_nonzero(hits))
+        # !!! NEW: Functions to call with the ID of each brick that is removed (e.g.
+        # to update a picture of the wall, see BrickLayer in renderer.py)
+        self.listeners = []
+
+    @classmethod
+    def for_level(cls, level=1, pack=None):
+        """
+        Returns the wall of a level (1 is the first), from `pack` or the game's own
+        level pack. There are no bricks past the last level.
+        """
+        if pack is None:
+            pack = LEVEL_PACK
+        if not 1 <= level <= len(pack):
+            return cls(np.zeros((0, 0)), np.zeros((0, 0)), [None])
+        return cls(pack.colors[level - 1], pack.hits[level - 1], pack.palette)
+
+    def arrays(self):
+        """
+        Returns (colors, hits) as (rows, cols) NumPy arrays. They are views of the
+        grid's own bytes, so they follow the bricks as they break.
+        """
+        shape = (self.rows, self.cols)
+        return (np.frombuffer(self.colors, dtype=np.uint8).reshape(shape),
+                np.frombuffer(self.hits, dtype=np.uint8).reshape(shape))
+
+    def rect(self, brick):
+        """Returns a new Rect covering a brick."""
+        row, col = divmod(brick, self.cols)
+        return pygame.Rect(GRID_LEFT + col * CELL_WIDTH, GRID_TOP + row * CELL_HEIGHT, BRICK_WIDTH, BRICK_HEIGHT)
+
+    def color(self, brick):
+        """Returns a brick's (red, green, blue) color."""
+        return self.palette[self.colors[brick]]
+
+    def brick_at(self, x, y):
+        """Returns the ID of the brick covering pixel (x, y), or None."""
+        row, y_in_cell = divmod(y - GRID_TOP, CELL_HEIGHT)
+        col, x_in_cell = divmod(x - GRID_LEFT, CELL_WIDTH)
+        # Outside the grid, or on the padding around a brick
+        if not (0 <= row < self.rows and 0 <= col < self.cols) or x_in_cell >= BRICK_WIDTH or y_in_cell >= BRICK_HEIGHT:
+            return None
+        brick = row * self.cols + col
+        return brick if self.hits[brick] else None
+
+    def hit(self, brick):
+        """Takes one hit off a brick, and removes it if that was its last. Returns whether it broke."""
+        hits = self.hits[brick] - 1
+        if hits > 0:
+            self.hits[brick] = hits
+            return False
+        self.remove(brick)
+        return True
+
+    def remove(self, brick):
+        """Removes a brick, however many hits it had left."""
+        self.hits[brick] = 0
+        self.colors[brick] = 0
+        self.count -= 1
+        for listener in self.listeners:
+            listener(brick)
+
+    def __iter__(self):
+        return (brick for brick, hits in enumerate(self.hits) if hits)
+
+    def __len__(self):
+        return self.count
+
+    def colliding(self, rect):
+        """
+        Yields the ID of every brick that overlaps `rect`, top row first and left to
+        right within a row (the same order as iterating over the whole wall).
+        """
+        # Quick rejection: the rect is entirely above or below the wall
+        if rect.bottom <= GRID_TOP or rect.top >= GRID_TOP + self.rows * CELL_HEIGHT:
+            return
+        first_row = max((rect.top - GRID_TOP) // CELL_HEIGHT, 0)
+        last_row = min((rect.bottom - 1 - GRID_TOP) // CELL_HEIGHT, self.rows - 1)
+        first_col = max((rect.left - GRID_LEFT) // CELL_WIDTH, 0)
+        last_col = min((rect.right - 1 - GRID_LEFT) // CELL_WIDTH, self.cols - 1)
+        hits = self.hits
+        cols = self.cols
+        for row in range(first_row, last_row + 1):
+            top = GRID_TOP + row * CELL_HEIGHT
+            # The cell also covers the padding below its brick, so check the brick itself
+            if rect.top >= top + BRICK_HEIGHT:
+                continue
+            for col in range(first_col, last_col + 1):
+                brick = row * cols + col
+                if hits[brick]:
+                    left = GRID_LEFT + col * CELL_WIDTH
+                    if rect.left < left + BRICK_WIDTH and rect.right > left:
+                        yield brick
+
+    def first_colliding(self, rect):
+        """
+        Returns the ID of the first brick that overlaps `rect` (in the same order as
+        colliding()), or None.
+        """
+        # The same cell lookup as colliding(), written out so that the many small
+        # rects checked every frame (the ball and each laser) don't each pay for a
+        # generator
+        top = rect.top
+        bottom = rect.bottom
+        if bottom <= GRID_TOP or top >= GRID_TOP + self.rows * CELL_HEIGHT:
+            return None
+        left = rect.left
+        right = rect.right
+        row = (top - GRID_TOP) // CELL_HEIGHT
+        if row < 0:
+            row = 0
+        last_row = (bottom - 1 - GRID_TOP) // CELL_HEIGHT
+        if last_row >= self.rows:
+            last_row = self.rows - 1
+        first_col = (left - GRID_LEFT) // CELL_WIDTH
+        if first_col < 0:
+            first_col = 0
+        last_col = (right - 1 - GRID_LEFT) // CELL_WIDTH
+        if last_col >= self.cols:
+            last_col = self.cols - 1
+        hits = self.hits
+        cols = self.cols
+        while row <= last_row:
+            # The cell also covers the padding below its brick, so check the brick itself
+            if top < GRID_TOP + row * CELL_HEIGHT + BRICK_HEIGHT:
+                for col in range(first_col, last_col + 1):
+                    brick = row * cols + col
+                    if hits[brick]:
+                        brick_left = GRID_LEFT + col * CELL_WIDTH
+                        if left < brick_left + BRICK_WIDTH and right > brick_left:
+                            return brick
+            row += 1
+        return None
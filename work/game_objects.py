@@ -1,6 +1,14 @@
 import pygame
 import random
-import math
+# !!! NEW: Continuous collision for fast balls
+from swept_collision import move_ball_swept
+# !!! NEW: Array-backed particles
+from particles import ParticleSystem
+# !!! NEW: Cached text rendering
+from text_cache import shared_cache
+# !!! NEW: Power-up and effect timers run out through one queue
+from timers import TimerQueue
+from levels import BRICK_HEIGHT
 
 # !!! PHASE 9: Font for power-up labels - will be initialized when needed
 POWERUP_FONT = None
@@ -11,38 +19,50 @@ def get_powerup_font():
         POWERUP_FONT = pygame.font.Font(None, 24)
     return POWERUP_FONT
 
+# !!! NEW: Interpolated drawing
+# The game logic runs at a fixed tick rate, but the screen may be redrawn at any
+# rate in between two ticks. Moving objects remember where they were at the start
+# of the current tick (prev_topleft), so they can be drawn part of the way between
+# the previous and current tick instead of jumping a whole tick at a time.
+def interpolated_rect(obj, alpha):
+    """
+    Returns a copy of obj.rect placed `alpha` of the way from its previous tick's
+    position (alpha=0) to its current one (alpha=1).
+    """
+    prev_x, prev_y = obj.prev_topleft
+    rect = obj.rect.copy()
+    rect.x = round(prev_x + (rect.x - prev_x) * alpha)
+    rect.y = round(prev_y + (rect.y - prev_y) * alpha)
+    return rect
+
 class Paddle:
-    def __init__(self, screen_width, screen_height):
+    # !!! PHASE 9: The power-ups the paddle keeps a timer for (the ball has its own
+    # for 'slow' and 'fast', and 'multi' doesn't wear off)
+    POWER_UPS = ('grow', 'laser', 'glue', 'wide', 'shield')
+    # The paddle's thickness, the thinnest thing the ball bounces off
+    HEIGHT = 10
+
+    def __init__(self, screen_width, screen_height, timers=None):
         """
         !!! PHASE 2: Adding the Paddle class
         Initializes the Paddle object.
         - screen_width, screen_height: Dimensions of the game window to handle boundaries.
+        - timers: The TimerQueue that makes power-ups wear off (the GameSession's).
+          Whoever owns it advances it once per tick.
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.timers = timers if timers is not None else TimerQueue()
 
         # Define paddle properties
         self.original_width = 100
         self.width = self.original_width
-        self.height = 10
+        self.height = self.HEIGHT
         self.speed = 7
         self.color = (200, 200, 200)
 
-        # !!! PHASE 7: Power-up related attributes
-        self.power_up_active = False
-        self.power_up_timer = 0
-        
-        # !!! PHASE 9: More power-up attributes
-        self.power_up_timers = {
-            'grow': 0,
-            'laser': 0,
-            'glue': 0,
-            'slow': 0,
-            'multi': 0,
-            'fast': 0,
-            'wide': 0,
-            'shield': 0
-        }
+        # !!! PHASE 9: Power-up attributes
+        # (how long each one has left is kept in self.timers, see time_left())
         self.has_laser = False
         self.has_glue = False
         self.has_shield = False
@@ -55,21 +75,27 @@ class Paddle:
             self.width,
             self.height
         )
+        self.prev_topleft = self.rect.topleft
 
-    def update(self):
+    def update(self, move_left=None, move_right=None):
         """
         !!! PHASE 2: Paddle movement and boundary checking
         Updates the paddle's position based on keyboard input and handles boundaries.
         This method is called once every frame from the main loop.
+        - move_left, move_right: Movement input for this frame. When left out,
+          the keyboard is read directly (the headless GameSession always passes them).
         """
-        # Get all the keys currently being pressed
-        keys = pygame.key.get_pressed()
+        if move_left is None or move_right is None:
+            # Get all the keys currently being pressed
+            keys = pygame.key.get_pressed()
+            move_left = keys[pygame.K_LEFT]
+            move_right = keys[pygame.K_RIGHT]
 
         # Move left if the left arrow key is pressed
-        if keys[pygame.K_LEFT]:
+        if move_left:
             self.rect.x -= self.speed
         # Move right if the right arrow key is pressed
-        if keys[pygame.K_RIGHT]:
+        if move_right:
             self.rect.x += self.speed
 
         # Boundary checking to keep the paddle on the screen
@@ -77,28 +103,16 @@ class Paddle:
             self.rect.left = 0
         if self.rect.right > self.screen_width:
             self.rect.right = self.screen_width
-            
-        # !!! PHASE 7: Handle power-up timer
-        if self.power_up_active:
-            self.power_up_timer -= 1
-            if self.power_up_timer <= 0:
-                # Power-up wears off, reset paddle size
-                self.width = self.original_width
-                self.rect.width = self.width
-                # Center the paddle after resizing
-                self.rect.x += (150 - self.original_width) // 2
-                self.power_up_active = False
-                
-        # !!! PHASE 9: Update all power-up timers
-        self._update_power_ups()
-
-    def draw(self, screen):
+
+    def draw(self, screen, rect=None):
         """
         !!! PHASE 2: Paddle drawing
         Draws the paddle onto the provided screen surface.
         - screen: The main pygame screen object to draw on.
+        - rect: Where to draw it, if not at self.rect (used for interpolation).
+        Returns the area of the screen that was drawn on.
         """
-        pygame.draw.rect(screen, self.color, self.rect)
+        return pygame.draw.rect(screen, self.color, rect or self.rect)
 
     # !!! PHASE 5: Add reset method for paddle
     def reset(self):
@@ -109,116 +123,85 @@ class Paddle:
         # !!! PHASE 7: Reset power-up effects
         self.width = self.original_width
         self.rect.width = self.width
-        self.power_up_active = False
-        self.power_up_timer = 0
         # !!! PHASE 9: Reset all power-ups
         self.has_laser = False
         self.has_glue = False
         self.has_shield = False
-        for power_up in self.power_up_timers:
-            self.power_up_timers[power_up] = 0
+        for type in self.POWER_UPS:
+            self.timers.cancel(('paddle', type))
+        # A reset is a jump, not a movement, so don't interpolate across it
+        self.prev_topleft = self.rect.topleft
 
     # !!! PHASE 7: Add power-up activation method
     def activate_power_up(self, type, duration=600):
         """ 
-        !!! PHASE 7&9: Activates a power-up effect on the paddle.
-        """
-        if type == 'grow':
-            if self.power_up_timers['grow'] <= 0: # Only grow if not already grown
-                current_center = self.rect.centerx
-                self.width = 150
-                self.rect.width = self.width
-                self.rect.centerx = current_center
-            self.power_up_timers['grow'] = duration
-        elif type == 'laser':
+        !!! PHASE 7&9: Activates a power-up effect on the paddle for `duration`
+        ticks. Collecting one that is already active starts its time over.
+        """
+        if type == 'laser':
             self.has_laser = True
-            self.power_up_timers['laser'] = duration
         elif type == 'glue':
             self.has_glue = True
-            self.power_up_timers['glue'] = duration
-        elif type == 'slow':
-            # !!! NEW: Slow power-up
-            self.power_up_timers['slow'] = duration
-        elif type == 'multi':
-            # !!! NEW: Multi-ball power-up (not fully implemented)
-            self.power_up_timers['multi'] = duration
-        elif type == 'fast':
-            # !!! NEW: Fast ball power-up (not fully implemented)
-            self.power_up_timers['fast'] = duration
-        elif type == 'wide':
-            # Even wider paddle than grow
-            if self.power_up_timers['wide'] <= 0:
-                current_center = self.rect.centerx
-                self.width = 200  # Extra wide
-                self.rect.width = self.width
-                self.rect.centerx = current_center
-            self.power_up_timers['wide'] = duration
         elif type == 'shield':
             # Shield gives extra protection
             self.has_shield = True
-            self.power_up_timers['shield'] = duration
-            
-    def _update_power_ups(self):
+        self.start_timer(type, duration)
+        if type in ('grow', 'wide'):
+            self._resize()
+
+    def start_timer(self, type, duration):
+        """!!! NEW: Makes power-up `type` wear off in `duration` ticks."""
+        self.timers.schedule(('paddle', type), duration, lambda: self._power_up_ended(type))
+
+    def time_left(self, type):
+        """!!! NEW: How many ticks power-up `type` has left (0 if it isn't active)."""
+        return self.timers.remaining(('paddle', type))
+
+    def _power_up_ended(self, type):
         """ 
-        !!! PHASE 9: Internal method to handle countdowns and deactivation of power-ups.
-        """
-        # Grow
-        if self.power_up_timers['grow'] > 0:
-            self.power_up_timers['grow'] -= 1
-            if self.power_up_timers['grow'] <= 0:
-                current_center = self.rect.centerx
-                self.width = self.original_width
-                self.rect.width = self.width
-                self.rect.centerx = current_center
-        # Laser
-        if self.power_up_timers['laser'] > 0:
-            self.power_up_timers['laser'] -= 1
-            if self.power_up_timers['laser'] <= 0:
-                self.has_laser = False
-        # Glue
-        if self.power_up_timers['glue'] > 0:
-            self.power_up_timers['glue'] -= 1
-            if self.power_up_timers['glue'] <= 0:
-                self.has_glue = False
-        # Slow
-        if self.power_up_timers['slow'] > 0:
-            self.power_up_timers['slow'] -= 1
-            if self.power_up_timers['slow'] <= 0:
-                pass # Slow effect ends, but not implemented
-        # Multi
-        if self.power_up_timers['multi'] > 0:
-            self.power_up_timers['multi'] -= 1
-            if self.power_up_timers['multi'] <= 0:
-                pass # Multi-ball effect ends, but not implemented
-        # Fast
-        if self.power_up_timers['fast'] > 0:
-            self.power_up_timers['fast'] -= 1
-            if self.power_up_timers['fast'] <= 0:
-                pass # Fast ball effect ends, but not fully implemented
-        # Wide
-        if self.power_up_timers['wide'] > 0:
-            self.power_up_timers['wide'] -= 1
-            if self.power_up_timers['wide'] <= 0:
-                # Revert to normal size when wide power-up ends
-                current_center = self.rect.centerx
-                self.width = self.original_width
-                self.rect.width = self.width
-                self.rect.centerx = current_center
-        # Shield
-        if self.power_up_timers['shield'] > 0:
-            self.power_up_timers['shield'] -= 1
-            if self.power_up_timers['shield'] <= 0:
-                self.has_shield = False
+        !!! PHASE 9: Undoes a power-up's effect when its time is up.
+        """
+        if type == 'laser':
+            self.has_laser = False
+        elif type == 'glue':
+            self.has_glue = False
+        elif type == 'shield':
+            self.has_shield = False
+        elif type in ('grow', 'wide'):
+            self._resize()
+
+    def _resize(self):
+        """
+        Sets the paddle's width for the size power-ups that are still active (wide
+        beats grow), keeping its center where it is.
+        """
+        if ('paddle', 'wide') in self.timers:
+            width = 200 # Extra wide
+        elif ('paddle', 'grow') in self.timers:
+            width = 150
+        else:
+            width = self.original_width
+        if width != self.width:
+            current_center = self.rect.centerx
+            self.width = width
+            self.rect.width = width
+            self.rect.centerx = current_center
 
 # !!! PHASE 3: Add Ball class
 class Ball:
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, rng=None, timers=None):
         """
         !!! PHASE 3: Adding the Ball class
         Initializes the Ball object.
+        - rng: Where the ball's random launch directions come from (anything with the
+          same methods as the `random` module, e.g. a random.Random). Defaults to the
+          `random` module itself.
+        - timers: The TimerQueue that ends the slow and fast effects (the GameSession's).
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.rng = rng if rng is not None else random
+        self.timers = timers if timers is not None else TimerQueue()
 
         # Define ball properties
         self.radius = 10
@@ -231,14 +214,26 @@ class Ball:
         # !!! PHASE 9: Ball states for power-ups
         self.is_glued = False
         self.is_slowed = False
-        self.slow_timer = 0
         self.base_speed = 6
 
         # !!! NEW: Enhanced ball attributes for new power-ups
         self.is_fast = False
-        self.fast_timer = 0
         self.fast_speed_multiplier = 1.5
 
+        # !!! NEW: Swept collision settings
+        # Up to this speed (pixels per frame on either axis) the ball simply jumps and
+        # then checks for overlaps, as it always has. At this speed a jump still lands
+        # overlapping the thinnest thing it bounces off (the paddle, or a brick) if it
+        # crosses it, however the two line up. Any faster and it could jump clean past
+        # it, so it is moved with swept collision instead (see swept_collision.py).
+        # Every ball speed in the game stays under this, so normal play (and
+        # batch_sim.py, which copies it) never sweeps.
+        self.max_discrete_speed = min(Paddle.HEIGHT, BRICK_HEIGHT) + self.radius * 2 - 1
+        # Set to True to always use swept collision, whatever the speed
+        self.always_sweep = False
+        # The bricks the last update() hit on its own (only with swept collision)
+        self.swept_hits = []
+
         # Call reset to set the initial position and speed
         self.reset()
 
@@ -249,14 +244,34 @@ class Ball:
         """
         self.rect.center = (self.screen_width // 2, self.screen_height // 2)
         # Give the ball a random horizontal direction to start
-        self.speed_x = self.base_speed * random.choice((1, -1))
+        self.speed_x = self.base_speed * self.rng.choice((1, -1))
         self.speed_y = -self.base_speed # Start moving upwards
         # !!! PHASE 9: Reset ball states
         self.is_glued = False
         self.is_slowed = False
-        self.slow_timer = 0
+        self.is_fast = False
+        self.timers.cancel(('ball', 'slow'))
+        self.timers.cancel(('ball', 'fast'))
+        # A reset is a jump, not a movement, so don't interpolate across it
+        self.prev_topleft = self.rect.topleft
+
+    def move_to(self, x, y, speed_x, speed_y):
+        """
+        !!! NEW: Puts the ball at (x, y) (its top-left corner), heading the way
+        (speed_x, speed_y) points at its usual speed. Used when an extra ball of
+        multi-ball takes over as the main ball.
+        """
+        self.rect.topleft = (round(x), round(y))
+        self.prev_topleft = self.rect.topleft
+        self.speed_x = speed_x
+        self.speed_y = speed_y
+        self._apply_speed()
 
-    def update(self, paddle, bounce_sound=None, launch_ball=False):
+    def needs_sweep(self):
+        """!!! NEW: Whether the ball is moving too fast for the simple overlap check."""
+        return self.always_sweep or max(abs(self.speed_x), abs(self.speed_y)) > self.max_discrete_speed
+
+    def update(self, paddle, bounce_sound=None, launch_ball=False, bricks=None):
         """
         !!! PHASE 3&9: Ball movement and collision detection
         Updates the ball's position and handles all collisions.
@@ -264,8 +279,12 @@ class Ball:
         - paddle: The player's paddle object, needed for collision checks.
         - bounce_sound: Sound to play when bouncing (Phase 8)
         - launch_ball: Whether to launch the ball if it's glued (Phase 9)
+        - bricks: The level's BrickGrid. When given and the ball needs it, the ball
+          uses swept collision and bounces off bricks itself; the bricks it hit are
+          left in self.swept_hits for the caller to break.
         """
         collision_object = None
+        self.swept_hits = []
         
         # !!! PHASE 9: Handle Glue State
         if self.is_glued:
@@ -273,17 +292,20 @@ class Ball:
             self.rect.bottom = paddle.rect.top
             if launch_ball:
                 self.is_glued = False
-                self.speed_x = self.base_speed * random.choice((1, -1))
-                self.speed_y = -self.base_speed
+                speed = self.speed()
+                self.speed_x = speed * self.rng.choice((1, -1))
+                self.speed_y = -speed
             return 'playing', None # Don't move further if glued
 
-        # !!! PHASE 9: Handle Slow State
-        if self.is_slowed:
-            self.slow_timer -= 1
-            if self.slow_timer <= 0:
-                self.speed_x = self.speed_x * 2
-                self.speed_y = self.speed_y * 2
-                self.is_slowed = False
+        # !!! NEW: Fast balls find their first time of impact instead of jumping
+        if bricks is not None and self.needs_sweep():
+            collision_object, self.swept_hits = move_ball_swept(self, paddle, bricks)
+            # !!! PHASE 8: Play bounce sound
+            if collision_object and bounce_sound:
+                bounce_sound.play()
+            if self.rect.top > self.screen_height:
+                return 'lost', None
+            return 'playing', collision_object
         
         # Move the ball
         self.rect.x += self.speed_x
@@ -327,46 +349,60 @@ class Ball:
         return 'playing', collision_object
     
     # !!! PHASE 9: Add slow power-up effect to ball
-    def apply_slow(self):
-        """Apply slow effect to the ball."""
+    def apply_slow(self, duration=600):
+        """Apply slow effect to the ball for `duration` frames (600 = 10 seconds at 60 FPS)."""
         if not self.is_slowed:
-            self.speed_x = self.speed_x // 2
-            self.speed_y = self.speed_y // 2
             self.is_slowed = True
-            self.slow_timer = 600  # 10 seconds at 60 FPS
+            self._apply_speed()
+            self.start_timer('slow', duration)
 
     # !!! PHASE 9: Add fast power-up effect to ball
-    def apply_fast(self):
-        """Apply fast effect to the ball."""
+    def apply_fast(self, duration=600):
+        """Apply fast effect to the ball for `duration` frames (600 = 10 seconds at 60 FPS)."""
         if not self.is_fast:
-            self.speed_x = int(self.speed_x * self.fast_speed_multiplier)
-            self.speed_y = int(self.speed_y * self.fast_speed_multiplier)
             self.is_fast = True
-            self.fast_timer = 600  # 10 seconds at 60 FPS
+            self._apply_speed()
+            self.start_timer('fast', duration)
 
-    def draw(self, screen):
-        """
-        !!! PHASE 3: Ball drawing
-        Draws the ball on the screen as a circle.
-        """
-        pygame.draw.ellipse(screen, self.color, self.rect)
+    def start_timer(self, effect, duration):
+        """!!! NEW: Makes the 'slow' or 'fast' effect wear off in `duration` frames."""
+        self.timers.schedule(('ball', effect), duration, lambda: self._effect_ended(effect))
 
-# !!! PHASE 4: Add Brick class
-class Brick:
-    def __init__(self, x, y, width, height, color):
-        """
-        !!! PHASE 4: Adding the Brick class
-        Initializes the Brick object.
-        """
-        self.rect = pygame.Rect(x, y, width, height)
-        self.color = color
+    def time_left(self, effect):
+        """!!! NEW: How many frames the 'slow' or 'fast' effect has left (0 if it isn't on)."""
+        return self.timers.remaining(('ball', effect))
+
+    def _effect_ended(self, effect):
+        """Takes the slow or fast effect off again."""
+        if effect == 'slow':
+            self.is_slowed = False
+        else:
+            self.is_fast = False
+        self._apply_speed()
 
-    def draw(self, screen):
+    def speed(self):
+        """!!! NEW: How fast the ball moves along each axis, with the slow and fast effects."""
+        speed = self.base_speed
+        if self.is_slowed:
+            speed //= 2
+        if self.is_fast:
+            speed = int(speed * self.fast_speed_multiplier)
+        return speed
+
+    def _apply_speed(self):
+        """Sets the ball's speed for its effects, keeping the direction it's moving in."""
+        speed = self.speed()
+        self.speed_x = speed if self.speed_x >= 0 else -speed
+        self.speed_y = speed if self.speed_y >= 0 else -speed
+
+    def draw(self, screen, rect=None):
         """
-        !!! PHASE 4: Brick drawing
-        Draws the brick onto the screen.
+        !!! PHASE 3: Ball drawing
+        Draws the ball on the screen as a circle.
+        - rect: Where to draw it, if not at self.rect (used for interpolation).
+        Returns the area of the screen that was drawn on.
         """
-        pygame.draw.rect(screen, self.color, self.rect)
+        return pygame.draw.ellipse(screen, self.color, rect or self.rect)
 
 # !!! PHASE 7&9: Add PowerUp class
 class PowerUp:
@@ -392,6 +428,15 @@ class PowerUp:
         self.height = 15
         self.rect = pygame.Rect(x, y, self.width, self.height)
         self.speed_y = 3
+        self.setup(x, y, type)
+
+    def setup(self, x, y, type='grow'):
+        """
+        !!! NEW: (Re)places the power-up at (x, y) with the given type.
+        Used by the constructor and when a pooled power-up is reused.
+        """
+        self.rect.topleft = (x, y)
+        self.prev_topleft = self.rect.topleft
         self.type = type
         # !!! PHASE 9: Set color and character based on type
         self.color = self.PROPERTIES[type]['color']
@@ -404,17 +449,21 @@ class PowerUp:
         """
         self.rect.y += self.speed_y
 
-    def draw(self, screen):
+    def draw(self, screen, rect=None):
         """ 
         !!! PHASE 7&9: Power-up drawing with type indication
         Draws the power-up with identifying letter.
+        - rect: Where to draw it, if not at self.rect (used for interpolation).
+        Returns the area of the screen that was drawn on.
         """
+        rect = rect or self.rect
         # Draw the power-up box
-        pygame.draw.rect(screen, self.color, self.rect)
+        pygame.draw.rect(screen, self.color, rect)
         # Draw the identifying letter
-        text_surf = get_powerup_font().render(self.char, True, (255, 255, 255))
-        text_rect = text_surf.get_rect(center=self.rect.center)
+        text_surf = shared_cache.render(get_powerup_font(), self.char, (255, 255, 255))
+        text_rect = text_surf.get_rect(center=rect.center)
         screen.blit(text_surf, text_rect)
+        return rect
 
 # !!! PHASE 9: Add Laser class
 class Laser:
@@ -427,6 +476,15 @@ class Laser:
         self.rect = pygame.Rect(x, y, self.width, self.height)
         self.color = (255, 255, 0) # Yellow laser
         self.speed_y = -8
+        self.setup(x, y)
+
+    def setup(self, x, y):
+        """
+        !!! NEW: (Re)places the laser at (x, y).
+        Used by the constructor and when a pooled laser is reused.
+        """
+        self.rect.topleft = (x, y)
+        self.prev_topleft = self.rect.topleft
 
     def update(self):
         """ 
@@ -434,54 +492,35 @@ class Laser:
         """
         self.rect.y += self.speed_y
 
-    def draw(self, screen):
+    def draw(self, screen, rect=None):
         """ 
         !!! PHASE 9: Draws the laser.
+        - rect: Where to draw it, if not at self.rect (used for interpolation).
+        Returns the area of the screen that was drawn on.
         """
-        pygame.draw.rect(screen, self.color, self.rect)
+        return pygame.draw.rect(screen, self.color, rect or self.rect)
 
 # !!! PHASE 11: Add visual effects classes
-class Particle:
-    def __init__(self, x, y, color, min_size, max_size, min_speed, max_speed, gravity):
-        """
-        !!! PHASE 11: Particle system for explosions
-        """
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = random.randint(min_size, max_size)
-        self.gravity = gravity
-        angle = random.uniform(0, 360)
-        speed = random.uniform(min_speed, max_speed)
-        self.vx = speed * math.cos(math.radians(angle))
-        self.vy = speed * math.sin(math.radians(angle))
-
-    def update(self):
-        """Update particle position and size."""
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += self.gravity
-        self.size -= 0.1 # Particles shrink over time
-
-    def draw(self, screen):
-        """Draw the particle if it's still visible."""
-        if self.size > 0:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), int(self.size))
-
 class Firework:
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, particles=None, rng=None):
         """
         !!! PHASE 11: Firework system for victory celebration
+        - particles: A ParticleSystem to explode into. When several fireworks share
+          the game's system, each one is done as soon as it has exploded, and the
+          system takes care of the sparks. Without one, the firework keeps its own.
+        - rng: Where the random position, speed and color come from (defaults to `random`).
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.x = random.randint(0, screen_width)
+        self.rng = rng if rng is not None else random
+        self.x = self.rng.randint(0, screen_width)
         self.y = screen_height
-        self.vy = -random.uniform(8, 12) # Speed of the rocket
+        self.vy = -self.rng.uniform(8, 12) # Speed of the rocket
         self.color = (255, 255, 255) # White rocket
         self.exploded = False
-        self.particles = []
-        self.explosion_y = random.uniform(screen_height * 0.2, screen_height * 0.5)
+        self.owns_particles = particles is None
+        self.particles = ParticleSystem(64, self.rng.getrandbits(64)) if particles is None else particles
+        self.explosion_y = self.rng.uniform(screen_height * 0.2, screen_height * 0.5)
 
     def update(self):
         """Update firework rocket and explosion."""
@@ -489,23 +528,28 @@ class Firework:
             self.y += self.vy
             if self.y <= self.explosion_y:
                 self.exploded = True
-                explosion_color = (random.randint(50, 255), random.randint(50, 255), random.randint(50, 255))
-                for _ in range(50): # Create 50 particles on explosion
-                    self.particles.append(Particle(self.x, self.y, explosion_color, 2, 4, 1, 4, 0.1))
-        else:
-            for particle in self.particles[:]:
-                particle.update()
-                if particle.size <= 0:
-                    self.particles.remove(particle)
+                rng = self.rng
+                explosion_color = (rng.randint(50, 255), rng.randint(50, 255), rng.randint(50, 255))
+                # Create 50 particles on explosion
+                self.particles.emit(self.x, self.y, explosion_color, 50, 2, 4, 1, 4, 0.1)
+        elif self.owns_particles:
+            self.particles.update()
 
-    def draw(self, screen):
-        """Draw the firework rocket or explosion particles."""
+    def draw(self, screen, alpha=1.0, rects=None):
+        """
+        Draw the firework rocket or explosion particles.
+        - rects: If given, a list the screen areas that were drawn on are added to.
+        """
         if not self.exploded:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), 3)
-        else:
-            for particle in self.particles:
-                particle.draw(screen)
+            y = self.y - self.vy * (1.0 - alpha)
+            rect = pygame.draw.circle(screen, self.color, (int(self.x), int(y)), 3)
+            if rects is not None:
+                rects.append(rect)
+        elif self.owns_particles:
+            self.particles.draw(screen, alpha, rects)
 
     def is_dead(self):
         """Check if the firework is done displaying."""
-        return self.exploded and not self.particles
+        if self.owns_particles:
+            return self.exploded and not self.particles
+        return self.exploded
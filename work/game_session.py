@@ -0,0 +1,565 @@
+import os
+import random
+from game_objects import Paddle, Ball, PowerUp, Laser, Firework
+# !!! NEW: All particles (bounces, brick explosions, fireworks) share one array-backed system
+from particles import ParticleSystem
+# !!! NEW: Lasers and power-ups are recycled instead of created and thrown away
+from pool import ObjectPool
+# !!! NEW: Sessions can time their update phases for the frame profiler
+from profiler import NullProfiler
+# !!! NEW: Every timed effect runs out through one queue
+from timers import TimerQueue
+# !!! NEW: The extra balls of multi-ball live in NumPy arrays
+from multi_ball import BallSwarm
+from levels import MAX_LEVELS
+# !!! NEW: Endless mode plays on with generated levels, and the next level is
+# prepared in the background
+from level_gen import LevelGenerator, background
+from brick_grid import BrickGrid
+
+# !!! NEW: Headless game engine
+# Everything the main loop used to keep in module globals (score, lives, bricks,
+# power-ups, lasers, particles and the game state) lives on a GameSession object.
+# The session never touches the window, the clock or the speakers: main.py feeds it
+# one FrameInput per frame and reacts to the events it returns (sounds, mostly).
+# That means a session can be stepped as fast as the CPU allows, for example to
+# run thousands of simulated games for balancing or regression testing.
+
+# !!! NEW: The game logic always runs at this many steps (ticks) per second, no matter
+# how often the screen is redrawn. Every speed (pixels per tick) and every timer
+# (600 ticks = 10 seconds) in the game is measured in these ticks.
+TICK_RATE = 60
+
+POWER_UP_TYPES = ['grow', 'laser', 'glue', 'slow', 'multi', 'fast', 'wide', 'shield']
+# !!! PHASE 7&9: The chance that a brick broken by the ball drops a power-up
+POWER_UP_CHANCE = 0.2
+# How long a collected power-up lasts, in ticks (10 seconds)
+POWER_UP_DURATION = 600
+# !!! NEW: Seeds are whole numbers from 0 up to this, so recordings and snapshots
+# can store them as unsigned 64-bit numbers
+MAX_SEED = 2 ** 64 - 1
+
+def init_headless():
+    """
+    Initializes pygame with SDL's dummy video and audio drivers, so sessions
+    (and off-screen rendering) work on machines without a display or sound card.
+    Must be called before pygame.init() has been called anywhere else.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    pygame.init()
+
+# !!! NEW: Each control as one bit, for storing a frame's input in 4 bits (see replay.py)
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_SPACE = 4
+INPUT_MUTE = 8
+
+class FrameInput:
+    """
+    The player's input for a single frame.
+    - left, right: Whether the arrow keys are held down this frame.
+    - space, mute: Whether SPACE / M were pressed (key down) this frame.
+    """
+    def __init__(self, left=False, right=False, space=False, mute=False):
+        self.left = left
+        self.right = right
+        self.space = space
+        self.mute = mute
+
+    def to_bits(self):
+        """Returns the input as a number from 0 to 15, one INPUT_* bit per control."""
+        return ((INPUT_LEFT if self.left else 0) | (INPUT_RIGHT if self.right else 0)
+                | (INPUT_SPACE if self.space else 0) | (INPUT_MUTE if self.mute else 0))
+
+    @classmethod
+    def from_bits(cls, bits):
+        """Makes a FrameInput back from to_bits()'s number."""
+        return cls(bool(bits & INPUT_LEFT), bool(bits & INPUT_RIGHT), bool(bits & INPUT_SPACE), bool(bits & INPUT_MUTE))
+
+# The input used when step() is called without any
+NO_INPUT = FrameInput()
+
+def make_rngs(seed):
+    """
+    !!! NEW: Returns the (gameplay, effects) random number generators for a seed.
+    The two streams are independent: however many random numbers the effects use
+    (particles, fireworks), the gameplay numbers (ball directions, power-up drops)
+    come out the same.
+    """
+    return random.Random(f"{seed}:gameplay"), random.Random(f"{seed}:effects")
+
+def check_seed(seed):
+    """!!! NEW: Raises ValueError unless `seed` is from 0 to MAX_SEED."""
+    if not 0 <= seed <= MAX_SEED:
+        raise ValueError(f"A seed must be from 0 to {MAX_SEED}, not {seed}")
+
+class GameSession:
+    def __init__(self, screen_width=800, screen_height=600, max_levels=MAX_LEVELS, swept_collision=False,
+                 pooling=True, seed=None, power_up_chance=POWER_UP_CHANCE, power_up_duration=POWER_UP_DURATION,
+                 endless=False, ball_collisions=False):
+        """
+        Creates a new game, sitting on the title screen.
+        - screen_width, screen_height: Size of the playing field.
+        - max_levels: How many levels must be cleared to win.
+        - swept_collision: Always move the ball with swept collision. Otherwise it is
+          only used once the ball gets fast enough to tunnel through things.
+        - pooling: Reuse Laser and PowerUp objects through object pools (see pool.py).
+        - seed: Seeds all of the session's randomness, so the same seed and the same
+          inputs always play out the same game. A random seed is picked if left out
+          (it is kept in self.seed, so the game can still be replayed). Raises
+          ValueError if it isn't from 0 to MAX_SEED.
+        - power_up_chance: The chance that a brick broken by the ball drops a power-up
+          (0 plays the game without power-ups, like batch_sim.py does).
+        - power_up_duration: How many ticks a collected power-up lasts.
+        - endless: After the hand-made levels, carry on with levels generated from
+          the seed (see level_gen.py) for as long as the player survives. The game
+          can't be won, and max_levels is ignored.
+        - ball_collisions: Let the balls of multi-ball bounce off each other.
+        """
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.max_levels = max_levels
+        self.power_up_chance = power_up_chance
+        self.power_up_duration = power_up_duration
+
+        # !!! NEW: The session's own random number streams, instead of the global
+        # `random` module: one for everything that affects the game, and one for
+        # purely visual effects, so effects can never change how a game plays out.
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        check_seed(seed)
+        self.seed = seed
+        self.rng, self.effects_rng = make_rngs(seed)
+        self.endless = endless
+        # Generated levels are made on the prefetch thread (see prefetch_next_level)
+        self.level_generator = LevelGenerator(seed) if endless else None
+        # !!! NEW: The next level, prepared during play: (level number, a future for
+        # its BrickGrid, or None if there is no next level). Functions in
+        # level_listeners are called with each prepared BrickGrid on the background
+        # thread, to get their own things ready for it too (see Renderer.prepare_layer).
+        self.next_level = None
+        self.level_listeners = []
+
+        # !!! NEW: Power-up, ball effect and message timers (advanced once per tick)
+        self.timers = TimerQueue()
+        self.paddle = Paddle(screen_width, screen_height, self.timers)
+        self.ball = Ball(screen_width, screen_height, self.rng, self.timers)
+        self.ball.always_sweep = swept_collision
+        # !!! NEW: The balls the 'multi' power-up adds (see multi_ball.py)
+        self.extra_balls = BallSwarm(screen_width, screen_height, self.ball.rect.width, self.ball.color,
+                                     collide=ball_collisions)
+
+        # !!! NEW: Sound is still played by main.py, but the mute state is part of the
+        # game (it shows the "MUTED" indicator and the "SOUND ON" message).
+        self.sound_enabled = True
+
+        # !!! PHASE 11: Visual effects
+        self.particles = ParticleSystem(rng=self.effects_rng.getrandbits(64))
+        self.fireworks = []
+
+        # !!! PHASE 7: Power-ups list ---
+        self.power_ups = []
+        self.power_up_pool = ObjectPool(PowerUp, pooling)
+        # !!! PHASE 9: Lasers list ---
+        self.lasers = []
+        self.laser_pool = ObjectPool(Laser, pooling)
+
+        # !!! NEW: Set to a FrameProfiler to time each part of step()
+        self.profiler = NullProfiler()
+
+        self.frame = 0
+        self.reset()
+
+    def reset(self):
+        """
+        Puts everything back to the starting state and returns to the title screen.
+        """
+        self.paddle.reset()
+        self.ball.reset()
+        self.extra_balls.clear()
+        self.current_level = 1
+        self.bricks = self.create_bricks(self.current_level)
+        # Can be 'title_screen', 'playing', 'game_over', or 'you_win'
+        self.game_state = 'title_screen'
+        # !!! PHASE 6: Score and lives
+        self.score = 0
+        self.lives = 3
+        # !!! NEW: Statistics for the game so far (see tournament.py)
+        self.lives_lost = 0
+        self.power_ups_collected = 0
+        self.power_up_pool.release_all(self.power_ups)
+        self.laser_pool.release_all(self.lasers)
+        self.particles.clear()
+        self.fireworks.clear()
+        # !!! PHASE 10: Message system
+        self.display_message = ""
+        self.timers.cancel('message')
+
+    def configure(self, seed, swept_collision=False, endless=False, ball_collisions=False):
+        """
+        !!! NEW: Switches the session to another seed and mode (the same settings as
+        __init__), keeping the rest of the game as it is. The random streams start
+        over from the new seed, and a next level prepared for the old settings is
+        dropped. Used by snapshot.restore.
+        """
+        check_seed(seed)
+        self.seed = seed
+        # Reseeded in place: the ball holds on to self.rng
+        rng, effects_rng = make_rngs(seed)
+        self.rng.setstate(rng.getstate())
+        self.effects_rng.setstate(effects_rng.getstate())
+        self.endless = endless
+        self.level_generator = LevelGenerator(seed) if endless else None
+        self.next_level = None
+        self.ball.always_sweep = swept_collision
+        self.extra_balls.collide = ball_collisions
+
+    def show_message(self, message, duration=120):
+        """
+        !!! PHASE 10: Shows an on-screen message for `duration` frames.
+        """
+        self.display_message = message
+        self.timers.schedule('message', duration, self._clear_message)
+
+    def _clear_message(self):
+        self.display_message = ""
+
+    @property
+    def message_timer(self):
+        """How many more frames the message is shown for."""
+        return self.timers.remaining('message')
+
+    def step(self, inputs=None):
+        """
+        Advances the game by exactly one tick (1/TICK_RATE of a second of game time).
+        - inputs: A FrameInput with this frame's controls (no input if left out).
+        Returns a list of event names that happened during the frame, so the caller
+        can react to them: 'bounce', 'brick_hit', 'brick_break', 'laser', 'life_lost',
+        'game_over', 'level_up', 'you_win', 'power_up', 'mute' and 'start'.
+        """
+        if inputs is None:
+            inputs = NO_INPUT
+        events = []
+        self.frame += 1
+        self._remember_positions()
+
+        # !!! PHASE 5: Restart Logic ---
+        if inputs.space:
+            # !!! PHASE 12: Title Screen Logic
+            if self.game_state == 'title_screen':
+                # Start the game from title screen
+                self.game_state = 'playing'
+                events.append('start')
+            elif self.game_state != 'playing':
+                # Reset the game objects to their starting state and return to title
+                self.reset()
+            # !!! PHASE 9: Handle space key during gameplay
+            elif self.paddle.has_laser:
+                self._fire_lasers()
+                events.append('laser')
+
+        # !!! NEW: Mute button handling
+        if inputs.mute:
+            self.sound_enabled = not self.sound_enabled
+            self.show_message("SOUND ON" if self.sound_enabled else "SOUND MUTED")
+            events.append('mute')
+
+        # !!! PHASE 5: Updating Objects (only if the game is in the 'playing' state) ---
+        if self.game_state == 'playing':
+            self._update_playing(inputs, events)
+
+        # !!! NEW: Power-ups, ball effects and messages that run out this tick end here
+        self.timers.advance()
+
+        profiler = self.profiler
+        start = profiler.now()
+        self._update_effects()
+        profiler.lap('effects', start)
+        profiler.count('bricks', len(self.bricks))
+        profiler.count('balls', 1 + len(self.extra_balls))
+        profiler.count('power_ups', len(self.power_ups))
+        profiler.count('lasers', len(self.lasers))
+        profiler.count('particles', len(self.particles))
+        profiler.count('fireworks', len(self.fireworks))
+        return events
+
+    def _remember_positions(self):
+        """
+        !!! NEW: Stores where every moving object is before this tick moves it, so
+        the renderer can draw them in between two ticks (see interpolated_rect).
+        """
+        self.paddle.prev_topleft = self.paddle.rect.topleft
+        self.ball.prev_topleft = self.ball.rect.topleft
+        for power_up in self.power_ups:
+            power_up.prev_topleft = power_up.rect.topleft
+        for laser in self.lasers:
+            laser.prev_topleft = laser.rect.topleft
+
+    def _fire_lasers(self):
+        """Fire two lasers, one from each side of the paddle."""
+        paddle = self.paddle
+        self.lasers.append(self.laser_pool.acquire(paddle.rect.centerx - 30, paddle.rect.top))
+        self.lasers.append(self.laser_pool.acquire(paddle.rect.centerx + 30, paddle.rect.top))
+
+    def _update_playing(self, inputs, events):
+        """Runs the gameplay part of a frame (everything between input and drawing)."""
+        paddle = self.paddle
+        ball = self.ball
+        profiler = self.profiler
+        # When play starts, on the tick after a level up, or after the level was
+        # changed from outside (e.g. by restoring a snapshot). Not on the level up
+        # tick itself: the level thread would hold up drawing the new level.
+        if self.next_level is None or self.next_level[0] != self.current_level + 1:
+            self.prefetch_next_level()
+        start = profiler.now()
+
+        paddle.update(inputs.left, inputs.right)
+        # !!! PHASE 9: space launches a glued ball
+        ball_status, collision_object = ball.update(paddle, None, inputs.space, self.bricks)
+
+        if collision_object is not None:
+            events.append('bounce')
+        # !!! PHASE 11: Add particle effects for ball collisions
+        if collision_object in ['wall', 'paddle', 'paddle_glue']:
+            # Add a few yellow particles when ball bounces
+            self.particles.emit(ball.rect.centerx, ball.rect.centery, (255, 255, 0), 5, 1, 3, 1, 3, 0)
+
+        # !!! PHASE 6: Check for Loss of a Life ---
+        if ball_status == 'lost' and self.extra_balls:
+            # !!! NEW: With multi-ball, one of the other balls becomes the main ball
+            ball.move_to(*self.extra_balls.pop())
+        elif ball_status == 'lost':
+            self.lives -= 1
+            self.lives_lost += 1
+            events.append('life_lost')
+            if self.lives <= 0:
+                self.game_state = 'game_over'
+                events.append('game_over')
+            else:
+                # Reset ball and paddle position for the next life
+                ball.reset()
+                paddle.reset()
+        start = profiler.lap('paddle_ball', start)
+
+        self._collide_ball_with_bricks(events)
+        start = profiler.lap('bricks', start)
+        self._update_extra_balls(events)
+        start = profiler.lap('extra_balls', start)
+        self._update_power_ups(events)
+        start = profiler.lap('power_ups', start)
+        self._update_lasers(events)
+        profiler.lap('lasers', start)
+
+        # !!! PHASE 5: Check for Win ---
+        # !!! NEW: Level progression
+        if not self.bricks:
+            if self.endless or self.current_level < self.max_levels:
+                start = profiler.now()
+                self._advance_level()
+                profiler.lap('level_up', start)
+                events.append('level_up')
+            else:
+                # All levels completed!
+                self.game_state = 'you_win'
+                events.append('you_win')
+                # !!! PHASE 11: Create fireworks when winning
+                if self.effects_rng.random() < 0.3: # 30% chance each frame to create a firework
+                    self.fireworks.append(self.make_firework())
+
+    def make_firework(self):
+        """!!! PHASE 11: Returns a new firework that explodes into the session's particles."""
+        return Firework(self.screen_width, self.screen_height, self.particles, self.effects_rng)
+
+    def _collide_ball_with_bricks(self, events):
+        """!!! PHASE 4: Ball and Brick Collision ---"""
+        ball = self.ball
+        # !!! NEW: With swept collision the ball has already bounced off the bricks it
+        # hit this frame (possibly several, in order), they just need breaking.
+        if ball.swept_hits:
+            for brick in ball.swept_hits:
+                self._ball_hit_brick(brick, events)
+            return
+        # !!! NEW: Only the bricks in the grid cells the ball overlaps are tested, and
+        # only the first one hit counts (one brick per frame). Bricks are IDs in the
+        # BrickGrid (see brick_grid.py).
+        brick = self.bricks.first_colliding(ball.rect)
+        if brick is None:
+            return
+        # Reverse the ball's vertical direction
+        ball.speed_y *= -1
+        self._ball_hit_brick(brick, events)
+
+    def _update_extra_balls(self, events):
+        """!!! NEW: Moves the multi-ball balls and breaks the bricks they hit."""
+        balls = self.extra_balls
+        if not balls:
+            return
+        bounced, hit_balls, hit_bricks, _ = balls.update(self.paddle, self.bricks, self.ball.speed())
+        # One bounce sound for all of them
+        if bounced and 'bounce' not in events:
+            events.append('bounce')
+        bricks = self.bricks
+        for ball, brick in zip(hit_balls, hit_bricks):
+            # Unless another ball broke it earlier in this tick
+            if bricks.hits[brick]:
+                balls.bounce_off_brick(ball)
+                self._ball_hit_brick(brick, events)
+
+    def _ball_hit_brick(self, brick, events):
+        """Hits a brick with the ball. If it breaks, it may drop a power-up."""
+        color = self.bricks.color(brick)
+        if not self._hit_brick(brick, events):
+            return
+        x, y = self.bricks.rect(brick).center
+        # !!! PHASE 7&9: 20% chance to drop a power-up
+        if self.rng.random() < self.power_up_chance:
+            power_up_type = self.rng.choice(POWER_UP_TYPES)
+            self.drop_power_up(x, y, power_up_type)
+        # !!! PHASE 11: Add particle explosion when brick is destroyed
+        self.particles.emit(x, y, color, 15, 1, 4, 1, 4, 0.05) # 15 particles
+
+    def drop_power_up(self, x, y, type):
+        """Starts a power-up of the given type falling from (x, y)."""
+        self.power_ups.append(self.power_up_pool.acquire(x, y, type))
+
+    def pool_stats(self):
+        """!!! NEW: Statistics for each kind of recycled object, as a list of dicts."""
+        return [self.power_up_pool.stats(), self.laser_pool.stats(), self.particles.stats()]
+
+    def _hit_brick(self, brick, events):
+        """
+        !!! NEW: Takes one hit off a brick, and breaks and scores it if that was its
+        last. Returns whether it broke.
+        """
+        if not self.bricks.hit(brick):
+            events.append('brick_hit')
+            return False
+        # !!! PHASE 6: Increase score when a brick is hit
+        self.score += 10
+        events.append('brick_break')
+        return True
+
+    def _update_power_ups(self, events):
+        """!!! PHASE 7: Update and Check Power-Up Collisions ---"""
+        paddle = self.paddle
+        power_ups = self.power_ups
+        # The power-ups that are still falling are moved to the front of the list as
+        # we go, and the rest is cut off at the end (no list copies, no list.remove).
+        kept = 0
+        for power_up in power_ups:
+            power_up.update()
+            # Remove power-up if it goes off-screen
+            if power_up.rect.top > self.screen_height:
+                self.power_up_pool.release(power_up)
+            # Check for collision with paddle
+            elif paddle.rect.colliderect(power_up.rect):
+                self._collect_power_up(power_up.type)
+                self.power_ups_collected += 1
+                events.append('power_up')
+                self.power_up_pool.release(power_up)
+            else:
+                power_ups[kept] = power_up
+                kept += 1
+        del power_ups[kept:]
+
+    def _collect_power_up(self, type):
+        """!!! PHASE 9: Apply different power-up effects"""
+        duration = self.power_up_duration
+        if type == 'slow':
+            self.ball.apply_slow(duration)
+        elif type == 'fast':
+            self.ball.apply_fast(duration)
+        elif type == 'multi':
+            # !!! NEW: Multi-ball
+            self.extra_balls.split(self.ball)
+        else:
+            self.paddle.activate_power_up(type, duration)
+        # !!! PHASE 10: Show power-up message
+        self.show_message(PowerUp.PROPERTIES[type]['message'])
+
+    def _update_lasers(self, events):
+        """!!! PHASE 9: Update and Check Laser Collisions ---"""
+        lasers = self.lasers
+        kept = 0
+        for laser in lasers:
+            laser.update()
+            # Remove laser if it goes off-screen
+            if laser.rect.bottom < 0:
+                self.laser_pool.release(laser)
+                continue
+            # Check for collision with the bricks near the laser
+            brick = self.bricks.first_colliding(laser.rect)
+            if brick is not None:
+                color = self.bricks.color(brick)
+                if self._hit_brick(brick, events):
+                    # !!! PHASE 11: Add particle explosion for laser hits
+                    x, y = self.bricks.rect(brick).center
+                    self.particles.emit(x, y, color, 10, 1, 3, 1, 3, 0.05) # 10 particles for laser hits
+                self.laser_pool.release(laser)
+                continue
+            lasers[kept] = laser
+            kept += 1
+        del lasers[kept:]
+
+    def create_bricks(self, level):
+        """
+        !!! NEW: Returns the BrickGrid of a level: a hand-made one, or in endless mode
+        a generated one after those.
+        """
+        generator = self.level_generator
+        if generator is None or level <= MAX_LEVELS:
+            return BrickGrid.for_level(level)
+        return generator.create_bricks(level)
+
+    def prefetch_next_level(self):
+        """
+        !!! NEW: Starts preparing the level after the current one on the background
+        thread: its wall, its BrickGrid, and whatever the level listeners make for it.
+        Building all that at the moment the last brick breaks costs a few
+        milliseconds (mostly the renderer's picture of the wall), which would all
+        land on that one frame. Prepared while the level is being played, the level
+        up only has to swap the new wall in.
+        """
+        level = self.current_level + 1
+        future = None
+        if self.endless or level <= self.max_levels:
+            future = background().submit(self._prepare_level, level)
+        self.next_level = (level, future)
+
+    def _prepare_level(self, level):
+        """Builds a level's BrickGrid and hands it to the level listeners (runs in the background)."""
+        bricks = self.create_bricks(level)
+        for listener in self.level_listeners:
+            listener(bricks)
+        return bricks
+
+    def _advance_level(self):
+        """Swaps in the next level's wall and gives the player a fresh start."""
+        self.current_level += 1
+        prepared = self.next_level
+        if prepared is not None and prepared[0] == self.current_level and prepared[1] is not None:
+            # Normally long finished; if not, this waits for it
+            self.bricks = prepared[1].result()
+        else:
+            self.bricks = self.create_bricks(self.current_level)
+        # The level after this one is prepared from the next tick (see _update_playing)
+        self.ball.reset()
+        self.extra_balls.clear()
+        self.paddle.reset()
+        # Bonus score for completing level
+        self.score += 100 * self.current_level
+        self.show_message(f"LEVEL {self.current_level}!", 180)  # 3 seconds
+        # Clear power-ups for fresh start
+        self.power_up_pool.release_all(self.power_ups)
+        self.laser_pool.release_all(self.lasers)
+
+    def _update_effects(self):
+        """!!! PHASE 11: Update particles and fireworks ---"""
+        self.particles.update()
+
+        for firework in self.fireworks[:]:
+            firework.update()
+            if firework.is_dead():
+                self.fireworks.remove(firework)
@@ -0,0 +1,32 @@
+import pygame
+from game_session import FrameInput
+
+# !!! NEW: Input sources
+# The main loop doesn't read the keyboard itself any more. It asks an input source
+# for each game tick's FrameInput, and passes it every pygame event in case the
+# source cares. KeyboardInput is the player at the keyboard; replay.py has sources
+# that play back or record a game.
+
+class KeyboardInput:
+    """The player's keyboard: arrow keys are held, SPACE and M are presses."""
+    def __init__(self):
+        # SPACE / M presses wait here until a game tick is run to use them, so none are
+        # lost when a frame runs no tick at all (fast displays), and none are repeated
+        # when a frame runs several (slow displays).
+        self.pending = FrameInput()
+
+    def handle_event(self, event):
+        """Remembers SPACE and M presses for the next tick."""
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                self.pending.space = True
+            # !!! NEW: Mute button handling
+            elif event.key == pygame.K_m:
+                self.pending.mute = True
+
+    def next_frame(self):
+        """Returns the input for the next game tick."""
+        keys = pygame.key.get_pressed()
+        inputs = FrameInput(keys[pygame.K_LEFT], keys[pygame.K_RIGHT], self.pending.space, self.pending.mute)
+        self.pending = FrameInput()
+        return inputs
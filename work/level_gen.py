@@ -0,0 +1,141 @@
+# !!! NEW: Procedural levels
+# Makes as many levels as anyone can play from a seed, in the same level file
+# format as the hand-made ones (see level_pack.py). Every level is symmetric left
+# to right (and some top to bottom too), has its rows colored in bands of
+# BRICK_COLORS like the hand-made walls, and fills more of the grid the further
+# in it is. Later levels mix in bricks that take two or three hits.
+#
+# Each level only depends on the seed and its number, so level 40 of seed 7 is
+# always the same wall, however the player got there. The game makes each next
+# level on the background thread while the current one is played (see
+# GameSession.prefetch_next_level), so by the time the last brick breaks the next
+# wall is waiting.
+#
+#   python level_gen.py --seed 7 --show 12                  # print level 12
+#   python level_gen.py --seed 7 --count 200 -o endless.pack
+import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from levels import BRICK_COLORS
+from brick_grid import BrickGrid
+from level_pack import compile_levels, LevelPack
+
+GRID_COLS = 10
+# The wall has to end above where Ball.reset puts the ball (its top at y 290 on the
+# 600px screen): a 10th row would reach y 295, so the ball would start inside it
+MAX_ROWS = 9
+# Brick characters: the four colored bands, then the sturdier bricks
+BAND_CHARS = 'ROYG'
+LEGEND = ''.join(f"{char} = {red} {green} {blue}\n" for char, (red, green, blue) in zip(BAND_CHARS, BRICK_COLORS))
+LEGEND += "S = 192 192 192 x2\n" # Silver: two hits
+LEGEND += "D = 218 165 32 x3\n"  # Gold: three hits
+
+# Starting shapes for the left half of the wall, before the density is evened out
+def _noise(rows, cols, density, rng):
+    return [[rng.random() < density for col in range(cols)] for row in range(rows)]
+
+def _stripes(rows, cols, density, rng):
+    return [[row % 2 == 0] * cols for row in range(rows)]
+
+def _checker(rows, cols, density, rng):
+    return [[(row + col) % 2 == 0 for col in range(cols)] for row in range(rows)]
+
+def _pyramid(rows, cols, density, rng):
+    # Wide at the top, narrowing towards the middle of the wall
+    return [[col >= row for col in range(cols)] for row in range(rows)]
+
+def _frame(rows, cols, density, rng):
+    return [[row in (0, rows - 1) or col == 0 for col in range(cols)] for row in range(rows)]
+
+SHAPES = (_noise, _stripes, _checker, _pyramid, _frame)
+
+def level_density(level):
+    """The share of grid cells the generated level `level` aims to fill."""
+    return min(0.35 + 0.03 * level, 0.85)
+
+def generate_level(seed, level):
+    """Returns the text of generated level `level` (1 is the first) for `seed`."""
+    rng = random.Random(f"{seed}:level:{level}")
+    rows = rng.randint(4, min(4 + level // 3, MAX_ROWS))
+    half = GRID_COLS // 2
+    density = level_density(level)
+
+    # The left half: a shape, then cells switched on or off at random until it is
+    # as full as the density asks
+    cells = rng.choice(SHAPES)(rows, half, density, rng)
+    positions = [(row, col) for row in range(rows) for col in range(half)]
+    target = max(1, round(density * len(positions)))
+    filled = [position for position in positions if cells[position[0]][position[1]]]
+    empty = [position for position in positions if not cells[position[0]][position[1]]]
+    rng.shuffle(filled)
+    rng.shuffle(empty)
+    while len(filled) > target:
+        row, col = filled.pop()
+        cells[row][col] = False
+    while len(filled) < target:
+        row, col = empty.pop()
+        cells[row][col] = True
+        filled.append((row, col))
+    if rows > 4 and rng.random() < 0.3:
+        # Symmetric top to bottom as well
+        for row in range(rows // 2):
+            cells[rows - 1 - row] = list(cells[row])
+
+    # Colors in bands of one or two rows, and sturdier rows further in
+    band = rng.choice((1, 2))
+    offset = rng.randrange(len(BAND_CHARS))
+    sturdy = min(0.08 * (level - 5), 0.5) if level > 5 else 0
+    lines = []
+    for row in range(rows):
+        char = BAND_CHARS[(row // band + offset) % len(BAND_CHARS)]
+        if rng.random() < sturdy:
+            char = 'D' if level > 15 and rng.random() < 0.3 else 'S'
+        left = ''.join(char if cell else '.' for cell in cells[row])
+        lines.append(left + left[::-1])
+    return f"# Generated level {level} (seed {seed})\n{LEGEND}\n" + '\n'.join(lines) + '\n'
+
+def generate_pack(seed, level):
+    """Returns generated level `level` as a one-level LevelPack."""
+    return LevelPack(compile_levels([(f"generated level {level}", generate_level(seed, level))]))
+
+# One thread prepares the next level of every session (see
+# GameSession.prefetch_next_level), so many sessions don't mean many threads
+_executor = None
+
+def background():
+    """Returns the thread pool levels are made on in the background."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='level-gen')
+    return _executor
+
+class LevelGenerator:
+    def __init__(self, seed):
+        """Hands out generated levels for `seed`."""
+        self.seed = seed
+
+    def create_bricks(self, level):
+        """Generates level `level` and returns its BrickGrid."""
+        return BrickGrid.for_level(1, generate_pack(self.seed, level))
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate levels from a seed")
+    parser.add_argument('--seed', type=int, default=0, help="Which levels to make")
+    parser.add_argument('--show', type=int, metavar='LEVEL', help="Print the text of one level")
+    parser.add_argument('--first', type=int, default=1, help="The first level to generate")
+    parser.add_argument('--count', type=int, default=100, help="How many levels to put in the pack")
+    parser.add_argument('-o', '--output', metavar='FILE', help="Write the levels as a level pack")
+    args = parser.parse_args()
+
+    if args.show is not None:
+        print(generate_level(args.seed, args.show))
+    if args.output:
+        levels = [(f"generated level {level}", generate_level(args.seed, level))
+                  for level in range(args.first, args.first + args.count)]
+        data = compile_levels(levels)
+        with open(args.output, 'wb') as f:
+            f.write(data)
+        print(f"{args.count} levels, {len(data)} bytes, hash {LevelPack(data).hash[:16]}")
+
+if __name__ == '__main__':
+    main()
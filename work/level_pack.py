@@ -0,0 +1,222 @@
+# !!! NEW: Level files and compiled level packs
+# Levels are drawn as text, one character per brick on the level's grid
+# (level_data/level_1.txt and so on):
+#
+#   # Level 2: Diamond pattern
+#   R = 178 34 34
+#   S = 192 192 192 x3
+#
+#   ...RRRR...
+#   ..RSSSSR..
+#
+# Lines starting with # are comments and blank lines are skipped. A legend line
+# gives a brick character its color (red green blue) and, with xN, how many hits
+# it takes to break (1 if left out). Every other line is a row of the wall,
+# top row first: a legend character is a brick and '.' is a gap.
+#
+# Reading and checking text for every level every time the game starts doesn't
+# scale to packs of hundreds of levels, so the text files are compiled into one
+# binary level pack. Loading a pack is one file read: the levels are NumPy views
+# of the bytes that were read, with nothing parsed or copied. A pack has a
+# SHA-256 hash of its contents, so a damaged pack is caught when it is loaded,
+# and the hash says exactly which levels a game was played on.
+#
+#   python level_pack.py level_data -o level_data/levels.pack
+import os
+import re
+import struct
+import hashlib
+import argparse
+import numpy as np
+
+MAGIC = b'ARKL'
+VERSION = 1
+# magic, version, levels, rows, columns, colors, SHA-256 of everything after the header
+HEADER = struct.Struct('<4sBHBBB32s')
+# After the header: the palette (colors x 3 bytes of RGB), then one byte per grid
+# cell for every level with its palette index + 1 (0 for no brick), then one byte
+# per cell for every level with its hits to break.
+
+EMPTY = '.'
+LEGEND_LINE = re.compile(r'^(\S)\s*=\s*(\d+)\s+(\d+)\s+(\d+)(?:\s+x(\d+))?$')
+
+def parse_level(text, name='level'):
+    """
+    Reads a level's text. Returns (rows, legend): the rows of the wall as strings,
+    and {character: ((red, green, blue), hits)}.
+    Raises ValueError, naming `name` and the line, if the text isn't a valid level.
+    """
+    legend = {}
+    rows = []
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        match = LEGEND_LINE.match(line)
+        if match:
+            char, red, green, blue, hits = match.groups()
+            color = (int(red), int(green), int(blue))
+            hits = int(hits or 1)
+            if char == EMPTY or max(color) > 255 or not 1 <= hits <= 255:
+                raise ValueError(f"{name}:{number}: bad legend entry {line!r}")
+            legend[char] = (color, hits)
+            continue
+        unknown = set(line) - set(legend) - {EMPTY}
+        if unknown:
+            raise ValueError(f"{name}:{number}: {', '.join(sorted(map(repr, unknown)))} not in the legend")
+        rows.append(line)
+    if not rows:
+        raise ValueError(f"{name}: the level has no rows")
+    return rows, legend
+
+def compile_levels(levels):
+    """
+    Compiles levels into a level pack.
+    - levels: The levels in order, as (name, text) pairs.
+    Returns the pack as bytes.
+    """
+    parsed = [parse_level(text, name) for name, text in levels]
+    row_count = max(len(rows) for rows, legend in parsed)
+    col_count = max(len(row) for rows, legend in parsed for row in rows)
+    palette = {}
+    colors = np.zeros((len(parsed), row_count, col_count), dtype=np.uint8)
+    hits = np.zeros_like(colors)
+    for level, (rows, legend) in enumerate(parsed):
+        for row, line in enumerate(rows):
+            for col, char in enumerate(line):
+                if char == EMPTY:
+                    continue
+                color, brick_hits = legend[char]
+                if color not in palette:
+                    if len(palette) == 255:
+                        raise ValueError("A level pack can't have more than 255 colors")
+                    palette[color] = len(palette) + 1
+                colors[level, row, col] = palette[color]
+                hits[level, row, col] = brick_hits
+    body = bytes(channel for color in palette for channel in color) + colors.tobytes() + hits.tobytes()
+    return HEADER.pack(MAGIC, VERSION, len(parsed), row_count, col_count, len(palette),
+                       hashlib.sha256(body).digest()) + body
+
+def compile_files(paths):
+    """Compiles level files, in the order given, into a level pack. Returns the pack as bytes."""
+    levels = []
+    for path in paths:
+        with open(path) as f:
+            levels.append((path, f.read()))
+    return compile_levels(levels)
+
+def level_files(directory):
+    """Returns the level_<number>.txt files in a directory, in level order."""
+    found = []
+    for name in os.listdir(directory):
+        match = re.fullmatch(r'level_(\d+)\.txt', name)
+        if match:
+            found.append((int(match.group(1)), os.path.join(directory, name)))
+    return [path for number, path in sorted(found)]
+
+class LevelPack:
+    def __init__(self, data, verify=True):
+        """
+        Reads a compiled level pack.
+        - data: The pack's bytes.
+        - verify: Check the contents against the pack's hash.
+        Raises ValueError if `data` is not a level pack, or is damaged.
+        """
+        if data[:4] != MAGIC:
+            raise ValueError("Not a level pack")
+        _, version, levels, rows, cols, color_count, digest = HEADER.unpack_from(data)
+        if version != VERSION:
+            raise ValueError(f"Unsupported level pack version {version}")
+        if len(data) != HEADER.size + 3 * color_count + 2 * levels * rows * cols:
+            raise ValueError("Level pack has the wrong size")
+        if verify and hashlib.sha256(memoryview(data)[HEADER.size:]).digest() != digest:
+            raise ValueError("Level pack is damaged (its hash doesn't match)")
+        self.hash = digest.hex()
+        offset = HEADER.size + 3 * color_count
+        # Index 0 is "no brick", so the palette starts at 1
+        self.palette = [None] + [tuple(data[i:i + 3]) for i in range(HEADER.size, offset, 3)]
+        cells = np.frombuffer(data, dtype=np.uint8, offset=offset).reshape(2, levels, rows, cols)
+        # (levels, rows, cols) arrays: each brick's palette index (0 for none), and its hits
+        self.colors = cells[0]
+        self.hits = cells[1]
+
+    @classmethod
+    def load(cls, path, verify=True):
+        with open(path, 'rb') as f:
+            return cls(f.read(), verify)
+
+    def __len__(self):
+        return len(self.colors)
+
+    def bricks(self, level):
+        """
+        Yields (row, col, color, hits) for every brick of a level (1 is the first),
+        top row first and left to right.
+        """
+        colors = self.colors[level - 1]
+        palette = self.palette
+        rows, cols = np.nonzero(colors)
+        for row, col, color, hits in zip(rows.tolist(), cols.tolist(), colors[rows, cols].tolist(),
+                                         self.hits[level - 1][rows, cols].tolist()):
+            yield row, col, palette[color], hits
+
+def cache_dir():
+    """The directory compiled packs are cached in: the user's cache directory, not the game's."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'pygame-arkanoid')
+
+def _is_fresh(pack_path, paths):
+    """Whether `pack_path` exists and is newer than every file in `paths`."""
+    if not os.path.exists(pack_path):
+        return False
+    pack_time = os.path.getmtime(pack_path)
+    return all(os.path.getmtime(path) <= pack_time for path in paths)
+
+def load_cached(directory, pack_path):
+    """
+    Returns the LevelPack for the level files in `directory`. That is `pack_path`
+    (the compiled pack that ships with them) if it is newer than all of them.
+    Otherwise the files are compiled afresh, and the pack is cached in cache_dir()
+    for next time. This never writes next to the level files: a read-only install
+    works, and editing a level doesn't leave a changed pack in the source tree
+    (compile it with `python level_pack.py` to ship the change).
+    """
+    paths = level_files(directory)
+    if _is_fresh(pack_path, paths):
+        return LevelPack.load(pack_path)
+    # One cached pack per level directory
+    key = hashlib.sha256(os.path.abspath(directory).encode('utf-8')).hexdigest()[:16]
+    cached_path = os.path.join(cache_dir(), f"levels-{key}.pack")
+    if _is_fresh(cached_path, paths):
+        try:
+            return LevelPack.load(cached_path)
+        except ValueError:
+            pass # Damaged: compile again and replace it
+    data = compile_files(paths)
+    try:
+        os.makedirs(cache_dir(), exist_ok=True)
+        with open(cached_path, 'wb') as f:
+            f.write(data)
+    except OSError:
+        pass # Nowhere to cache it: the game still plays, it just compiles on every start
+    return LevelPack(data)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile level files into a level pack")
+    parser.add_argument('levels', nargs='+', help="The level files, in order (or one directory of level_N.txt files)")
+    parser.add_argument('-o', '--output', required=True, help="Where to write the level pack")
+    args = parser.parse_args()
+
+    paths = args.levels
+    if len(paths) == 1 and os.path.isdir(paths[0]):
+        paths = level_files(paths[0])
+    data = compile_files(paths)
+    with open(args.output, 'wb') as f:
+        f.write(data)
+    pack = LevelPack(data)
+    rows, cols = pack.colors.shape[1:]
+    print(f"{len(pack)} levels ({rows}x{cols} grid, {len(pack.palette) - 1} colors), "
+          f"{len(data)} bytes, hash {pack.hash[:16]}")
+
+if __name__ == '__main__':
+    main()
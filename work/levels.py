@@ -0,0 +1,21 @@
+import os
+from level_pack import load_cached
+
+# !!! PHASE 4: Brick colors
+BRICK_COLORS = [(178, 34, 34), (255, 165, 0), (255, 215, 0), (50, 205, 50)] # Red, Orange, Yellow, Green
+
+# Every level lays its bricks out on the same regular grid. BrickGrid
+# (brick_grid.py) works brick positions out from these numbers, and finds bricks
+# by position with them. BrickGrid.for_level creates a level's wall.
+BRICK_WIDTH = 75
+BRICK_HEIGHT = 20
+BRICK_PADDING = 5
+WALL_START_Y = 50
+
+# !!! NEW: Level Management --
+# The layouts are text files in level_data/, compiled into a level pack (see
+# level_pack.py). The compiled pack in level_data/ is used as long as it is newer
+# than every level file; after an edit, load_cached compiles the files itself.
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'level_data')
+LEVEL_PACK = load_cached(LEVEL_DIR, os.path.join(LEVEL_DIR, 'levels.pack'))
+MAX_LEVELS = len(LEVEL_PACK)
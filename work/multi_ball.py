@@ -0,0 +1,317 @@
+import math
+import numpy as np
+import pygame
+from brick_grid import CELL_WIDTH, CELL_HEIGHT, GRID_LEFT, GRID_TOP
+from levels import BRICK_WIDTH, BRICK_HEIGHT
+
+# !!! NEW: Multi-ball
+# The 'multi' power-up splits every ball in play into three. A few rounds of that
+# and there are hundreds of balls, far too many to give each one a Ball object and
+# an update() call. The extra balls live in NumPy arrays instead, like the
+# particles (see particles.py): one row for x, one for y, one for each speed. A tick
+# moves and bounces all of them with a few whole-array operations, and only the
+# balls that actually hit a brick get any Python code of their own.
+#
+# The session's Ball stays the main ball: the paddle glues it, the bots follow it,
+# and its slow and fast effects set the speed of every ball. When it is lost while
+# extra balls are still in play, one of them takes over as the main ball, and a
+# life is only lost with the last ball.
+#
+# Balls can also bounce off each other (BallSwarm(collide=True)). Testing every pair
+# of hundreds of balls would be tens of thousands of tests per tick, so the balls
+# are hashed into a grid of ball-sized cells first, and only balls in the same or
+# neighbouring cells are tested.
+
+FIELDS = ('x', 'y', 'vx', 'vy')
+X, Y, VX, VY = range(4)
+# The most balls in play at once, the main ball included
+MAX_BALLS = 256
+# How far either side of its ball's direction each new ball sets off
+SPLIT_ANGLE = math.radians(20)
+# Balls never fly flatter than this share of their speed going up or down, so
+# none ends up bouncing from wall to wall forever
+MIN_VERTICAL = 0.3
+# A ball is smaller than a grid cell, so it overlaps at most 2x2 cells: the one its
+# top-left corner is in and the ones right of and below that, in the order
+# BrickGrid.colliding checks them
+CELL_OFFSETS = ((0, 0), (0, 1), (1, 0), (1, 1))
+# For the ball-to-ball test: a ball's own cell and half of the cells around it, so
+# each pair of neighbouring cells is looked at once
+NEIGHBOR_CELLS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+class BallSwarm:
+    def __init__(self, screen_width, screen_height, size=20, color=(200, 200, 200), capacity=16,
+                 max_balls=MAX_BALLS, collide=False):
+        """
+        The extra balls of multi-ball.
+        - size: A ball's width and height (the main ball's rect).
+        - capacity: How many balls to make room for up front. The arrays double in
+          size whenever they run out of room.
+        - max_balls: The most balls in play at once, the main ball included.
+        - collide: Let the balls bounce off each other.
+        """
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.size = size
+        self.color = color
+        self.max_balls = max_balls
+        self.collide = collide
+        self.count = 0
+        self._sprite = None
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """(Re)creates the arrays with room for `capacity` balls, keeping live ones."""
+        data = np.zeros((len(FIELDS), capacity), dtype=np.float64)
+        if self.count:
+            data[:, :self.count] = self.data[:, :self.count]
+        self.data = data
+        self.capacity = capacity
+        # Handy views of the rows: self.x, self.y, self.vx, self.vy
+        for row, name in enumerate(FIELDS):
+            setattr(self, name, data[row])
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Removes every extra ball."""
+        self.count = 0
+
+    def add(self, balls):
+        """
+        Adds balls, as many as there is room for under max_balls.
+        - balls: A (4, n) array of x, y, x speed and y speed (x and y are the top-left
+          corner, like Rect.topleft).
+        """
+        balls = balls[:, :max(self.max_balls - 1 - self.count, 0)]
+        start = self.count
+        end = start + balls.shape[1]
+        if end > self.capacity:
+            self._allocate(max(end, self.capacity * 2))
+        self.data[:, start:end] = balls
+        self.count = end
+
+    def split(self, ball):
+        """
+        !!! NEW: Sends two more balls off from every ball in play (the main Ball
+        included), each turned SPLIT_ANGLE away from its ball's direction.
+        """
+        n = self.count
+        parents = np.empty((len(FIELDS), n + 1))
+        parents[:, 0] = (*ball.rect.topleft, ball.speed_x, ball.speed_y)
+        parents[:, 1:] = self.data[:, :n]
+        children = []
+        for angle in (SPLIT_ANGLE, -SPLIT_ANGLE):
+            cos, sin = math.cos(angle), math.sin(angle)
+            child = parents.copy()
+            child[VX] = parents[VX] * cos - parents[VY] * sin
+            child[VY] = parents[VX] * sin + parents[VY] * cos
+            children.append(child)
+        # Alternate the two turns, so a split cut short by max_balls is still even
+        self.add(np.stack(children, axis=2).reshape(len(FIELDS), -1))
+
+    def pop(self):
+        """Removes the last ball and returns its (x, y, x speed, y speed)."""
+        self.count -= 1
+        return tuple(self.data[:, self.count].tolist())
+
+    def update(self, paddle, bricks, speed):
+        """
+        Moves every ball one tick and bounces it off the walls, the paddle and the
+        other balls, and drops the balls that fell off the bottom.
+        - paddle: The Paddle. Extra balls bounce off it even when it has glue.
+        - bricks: The level's BrickGrid. The balls that touch a brick are only
+          reported; bouncing them and breaking the brick is up to the caller (see
+          bounce_off_brick).
+        - speed: The main ball's speed along each axis (Ball.speed()); every ball
+          moves as fast as a main ball flying diagonally.
+        Returns (bounced, hit_balls, hit_bricks, lost): whether any ball bounced off
+        a wall or the paddle, the index of each ball touching a brick and that
+        brick's ID (the first one it touches, top row first), and how many balls
+        were lost.
+        """
+        n = self.count
+        if n == 0:
+            return False, [], [], 0
+        x, y, vx, vy = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+        size = self.size
+
+        # Keep every ball at the main ball's speed (the slow and fast effects, and
+        # after bouncing off each other), and not too flat
+        target = speed * math.sqrt(2)
+        scale = target / np.maximum(np.hypot(vx, vy), 1e-9)
+        vx *= scale
+        vy *= scale
+        flat = np.abs(vy) < MIN_VERTICAL * target
+        if flat.any():
+            vy[flat] = np.where(vy[flat] < 0, -MIN_VERTICAL, MIN_VERTICAL) * target
+            vx[flat] = np.where(vx[flat] < 0, -1, 1) * math.sqrt(target ** 2 - (MIN_VERTICAL * target) ** 2)
+
+        x += vx
+        y += vy
+
+        # Walls: always send the ball back into the screen, whichever way it was going
+        left = x <= 0
+        right = x + size >= self.screen_width
+        top = y <= 0
+        vx[left] = np.abs(vx[left])
+        vx[right] = -np.abs(vx[right])
+        vy[top] = np.abs(vy[top])
+
+        # The paddle, only when coming down onto it. A fast ball could pass the
+        # paddle's top edge between two ticks, so crossing it counts as well.
+        rect = paddle.rect
+        bottom = y + size
+        on_paddle = ((vy > 0) & (x < rect.right) & (x + size > rect.left)
+                     & (bottom > rect.top) & ((y < rect.bottom) | (bottom - vy <= rect.top)))
+        vy[on_paddle] = -vy[on_paddle]
+        y[on_paddle] = rect.top - size
+        bounced = bool(left.any() or right.any() or top.any() or on_paddle.any())
+
+        if self.collide and n > 1:
+            self._collide_balls(n)
+
+        hit_balls, hit_bricks = self._touching_bricks(n, bricks)
+
+        # Drop the balls that fell off the bottom
+        kept = self.y[:n] <= self.screen_height
+        live = int(np.count_nonzero(kept))
+        if live < n:
+            if len(hit_balls):
+                # The balls after a lost one move forward in the arrays
+                hit_keep = kept[hit_balls]
+                hit_balls = (np.cumsum(kept) - 1)[hit_balls[hit_keep]]
+                hit_bricks = hit_bricks[hit_keep]
+            self.data[:, :live] = self.data[:, :n][:, kept]
+            self.count = live
+        return bounced, hit_balls.tolist(), hit_bricks.tolist(), n - live
+
+    def bounce_off_brick(self, ball):
+        """Sends a ball that hit a brick back the way it came vertically."""
+        self.vy[ball] = -self.vy[ball]
+
+    def _touching_bricks(self, n, bricks):
+        """
+        Returns (balls, bricks): the index of each ball that overlaps a brick, and the
+        ID of the first brick it overlaps.
+        """
+        if not bricks:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        hits = bricks.arrays()[1]
+        rows, cols = hits.shape
+        size = self.size
+        # Whole pixels, like a Rect
+        ball_x = self.x[:n].astype(np.int64)
+        ball_y = self.y[:n].astype(np.int64)
+        first_row = (ball_y - GRID_TOP) // CELL_HEIGHT
+        first_col = (ball_x - GRID_LEFT) // CELL_WIDTH
+        hit = np.zeros(n, dtype=bool)
+        hit_brick = np.zeros(n, dtype=np.intp)
+        for row_offset, col_offset in CELL_OFFSETS:
+            row = first_row + row_offset
+            col = first_col + col_offset
+            inside = (row >= 0) & (row < rows) & (col >= 0) & (col < cols)
+            safe_row = np.where(inside, row, 0)
+            safe_col = np.where(inside, col, 0)
+            brick_left = GRID_LEFT + col * CELL_WIDTH
+            brick_top = GRID_TOP + row * CELL_HEIGHT
+            # The cell also covers the padding around its brick, so check the brick itself
+            touching = (inside & ~hit & (hits[safe_row, safe_col] > 0)
+                        & (ball_x < brick_left + BRICK_WIDTH) & (ball_x + size > brick_left)
+                        & (ball_y < brick_top + BRICK_HEIGHT) & (ball_y + size > brick_top))
+            hit_brick[touching] = (row * cols + col)[touching]
+            hit |= touching
+        balls = np.flatnonzero(hit)
+        return balls, hit_brick[balls]
+
+    def _pairs(self, n):
+        """
+        Returns (first, second): index arrays of every pair of balls in the same or
+        neighbouring cells of a grid of ball-sized cells, each pair once.
+        """
+        size = self.size
+        stride = self.screen_height // size + 4
+        cell_x = ((self.x[:n] + size / 2) // size).astype(np.int64)
+        # Shifted down a row, so a neighbour above row 0 doesn't wrap into another column
+        cell_y = np.clip(((self.y[:n] + size / 2) // size).astype(np.int64) + 1, 0, stride - 2)
+        keys = cell_x * stride + cell_y
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        balls = np.arange(n)
+        firsts = []
+        seconds = []
+        for col_offset, row_offset in NEIGHBOR_CELLS:
+            wanted = keys + col_offset * stride + row_offset
+            start = np.searchsorted(sorted_keys, wanted, 'left')
+            counts = np.searchsorted(sorted_keys, wanted, 'right') - start
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            # Each ball against every ball in the wanted cell: repeat the ball once per
+            # ball there, and walk along that cell's run of the sorted balls
+            first = np.repeat(balls, counts)
+            position = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            second = order[np.repeat(start, counts) + position]
+            if col_offset == 0 and row_offset == 0:
+                # Within a cell, each pair once and no ball with itself
+                keep = first < second
+                first = first[keep]
+                second = second[keep]
+            firsts.append(first)
+            seconds.append(second)
+        if not firsts:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        return np.concatenate(firsts), np.concatenate(seconds)
+
+    def _collide_balls(self, n):
+        """Bounces touching balls that are moving towards each other off each other."""
+        first, second = self._pairs(n)
+        if len(first) == 0:
+            return
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        dx = x[second] - x[first]
+        dy = y[second] - y[first]
+        distance = np.hypot(dx, dy)
+        # Round balls touch when their centers are closer than one ball across
+        touching = (distance < self.size) & (distance > 0)
+        first, second, dx, dy, distance = first[touching], second[touching], dx[touching], dy[touching], distance[touching]
+        normal_x = dx / distance
+        normal_y = dy / distance
+        # How fast they close in along the line between their centers
+        closing = (vx[first] - vx[second]) * normal_x + (vy[first] - vy[second]) * normal_y
+        approaching = closing > 0
+        if not approaching.any():
+            return
+        first, second = first[approaching], second[approaching]
+        push_x = (closing * normal_x)[approaching]
+        push_y = (closing * normal_y)[approaching]
+        # Equal masses: they swap the parts of their speeds along that line. A ball
+        # touching several others adds up all of its bounces.
+        np.add.at(vx, first, -push_x)
+        np.add.at(vy, first, -push_y)
+        np.add.at(vx, second, push_x)
+        np.add.at(vy, second, push_y)
+
+    def draw(self, screen, alpha=1.0, rects=None):
+        """
+        Draws every ball.
+        - alpha: How far between the previous tick (0) and this one (1) to draw them.
+        - rects: If given, a list the screen areas that were drawn on are added to.
+        """
+        n = self.count
+        if n == 0:
+            return
+        if self._sprite is None:
+            # One picture of a ball, blitted once per ball
+            self._sprite = pygame.Surface((self.size, self.size))
+            self._sprite.set_colorkey((0, 0, 0))
+            pygame.draw.ellipse(self._sprite, self.color, self._sprite.get_rect())
+        # Step back along this tick's movement to where the balls were at `alpha`
+        back = 1.0 - alpha
+        xs = (self.x[:n] - self.vx[:n] * back).astype(np.int32).tolist()
+        ys = (self.y[:n] - self.vy[:n] * back).astype(np.int32).tolist()
+        sprite = self._sprite
+        drawn = screen.blits([(sprite, position) for position in zip(xs, ys)], rects is not None)
+        if rects is not None:
+            rects.extend(drawn)
@@ -0,0 +1,137 @@
+import numpy as np
+import pygame
+
+# !!! NEW: Struct-of-arrays particle system
+# Instead of one Particle object per spark (each with its own update() call and a
+# list.remove() when it dies), all particles live in a handful of NumPy arrays: one
+# for x, one for y, one for vx, and so on. Updating every particle is then a few
+# whole-array operations, and dead particles are squeezed out all at once.
+
+# All the fields are rows of one 2D array, so squeezing out dead particles is a
+# single operation no matter how many fields there are.
+FIELDS = ('x', 'y', 'vx', 'vy', 'size', 'gravity', 'red', 'green', 'blue')
+X, Y, VX, VY, SIZE, GRAVITY = range(6)
+COLOR = slice(6, 9)
+
+class ParticleSystem:
+    def __init__(self, capacity=1024, rng=None):
+        """
+        - capacity: How many particles to make room for up front. The arrays double
+          in size whenever they run out of room, so this is only a starting point.
+        - rng: A numpy.random.Generator to draw sizes, angles and speeds from, or a
+          seed to make one from. Left out, the particles are different every run.
+        """
+        self.rng = np.random.default_rng(rng)
+        self.count = 0
+        # Statistics: particles ever emitted, the most alive at once, and how many
+        # times the arrays had to grow (the only time emitting allocates memory)
+        self.emitted = 0
+        self.peak_count = 0
+        self.grown = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """(Re)creates the arrays with room for `capacity` particles, keeping live ones."""
+        data = np.zeros((len(FIELDS), capacity), dtype=np.float64)
+        if self.count:
+            data[:, :self.count] = self.data[:, :self.count]
+        self.data = data
+        self.capacity = capacity
+        # Handy views of the rows: self.x, self.y, self.vx, ...
+        for row, name in enumerate(FIELDS):
+            setattr(self, name, data[row])
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Removes every particle."""
+        self.count = 0
+
+    def emit(self, x, y, color, count, min_size, max_size, min_speed, max_speed, gravity):
+        """
+        !!! PHASE 11: Particle explosion
+        Adds `count` particles at (x, y), flying off in random directions.
+        - color: Their (red, green, blue) color.
+        - min_size, max_size: The range of their starting radius (a whole number).
+          Every particle shrinks by 0.1 a tick and vanishes at 0.
+        - min_speed, max_speed: The range of their starting speed.
+        - gravity: Added to each particle's downward speed every tick.
+        """
+        start = self.count
+        end = start + count
+        if end > self.capacity:
+            self._allocate(max(end, self.capacity * 2))
+            self.grown += 1
+        # One call for all the random numbers: angle, speed and size for each particle
+        angle, speed, size = self.rng.random((3, count))
+        angle *= 2 * np.pi
+        speed = min_speed + speed * (max_speed - min_speed)
+        block = self.data[:, start:end]
+        block[X] = x
+        block[Y] = y
+        block[VX] = speed * np.cos(angle)
+        block[VY] = speed * np.sin(angle)
+        # A whole number from min_size to max_size, like random.randint
+        block[SIZE] = np.floor(min_size + size * (max_size - min_size + 1))
+        block[GRAVITY] = gravity
+        block[COLOR] = np.reshape(color, (3, 1))
+        self.count = end
+        self.emitted += count
+        self.peak_count = max(self.peak_count, end)
+
+    def stats(self):
+        """Returns the system's statistics as a dict (in the same shape as ObjectPool.stats)."""
+        return {
+            'type': 'Particle',
+            # Particles aren't objects: the only allocations are the arrays themselves
+            'created': self.grown + 1,
+            'emitted': self.emitted,
+            'in_use': self.count,
+            'peak_in_use': self.peak_count,
+            'capacity': self.capacity,
+        }
+
+    def update(self):
+        """Moves every particle, shrinks it, and drops the ones that have vanished."""
+        n = self.count
+        if n == 0:
+            return
+        data = self.data
+        # x += vx and y += vy in one go
+        data[X:Y + 1, :n] += data[VX:VY + 1, :n]
+        data[VY, :n] += data[GRAVITY, :n]
+        data[SIZE, :n] -= 0.1 # Particles shrink over time
+
+        alive = data[SIZE, :n] > 0
+        live = int(np.count_nonzero(alive))
+        if live < n:
+            # Squeeze the survivors to the front of every row in one go
+            data[:, :live] = data[:, :n][:, alive]
+            self.count = live
+
+    def draw(self, screen, alpha=1.0, rects=None):
+        """
+        Draws every visible particle.
+        - alpha: How far between the previous tick (0) and this one (1) to draw them.
+        - rects: If given, a list the screen areas that were drawn on are added to.
+        """
+        n = self.count
+        if n == 0:
+            return
+        # Step back along this tick's movement to where the particles were at `alpha`
+        back = 1.0 - alpha
+        xs = (self.x[:n] - self.vx[:n] * back).astype(np.int32)
+        ys = (self.y[:n] - (self.vy[:n] - self.gravity[:n]) * back).astype(np.int32)
+        radii = self.size[:n].astype(np.int32)
+        visible = radii > 0
+        circle = pygame.draw.circle
+        colors = self.data[COLOR, :n][:, visible].T.astype(np.uint8)
+        particles = zip(xs[visible].tolist(), ys[visible].tolist(), radii[visible].tolist(), colors.tolist())
+        if rects is None:
+            for x, y, radius, color in particles:
+                circle(screen, color, (x, y), radius)
+        else:
+            add = rects.append
+            for x, y, radius, color in particles:
+                add(circle(screen, color, (x, y), radius))
@@ -0,0 +1,63 @@
+# !!! NEW: Object pooling
+# Lasers and power-ups come and go all the time. Creating a new object (and a new
+# pygame.Rect inside it) for every one, then throwing it away, keeps the memory
+# allocator and the garbage collector busy. A pool keeps objects that are no longer
+# needed and hands them out again, re-set up for their new job, next time one is asked
+# for. Once the pool has grown to what the game needs, nothing new is allocated.
+
+class ObjectPool:
+    def __init__(self, cls, enabled=True):
+        """
+        - cls: The class of object to pool. It must have a setup() method that takes
+          the same arguments as its constructor and re-initializes the object.
+        - enabled: When False, acquire() always creates a new object and release()
+          throws it away, which is handy to measure what the pool saves.
+        """
+        self.cls = cls
+        self.enabled = enabled
+        self.free = []
+        # Statistics
+        self.created = 0
+        self.acquired = 0
+        self.released = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+
+    def acquire(self, *args):
+        """Returns an object set up with `args`, reusing a released one if possible."""
+        if self.free:
+            obj = self.free.pop()
+            obj.setup(*args)
+        else:
+            obj = self.cls(*args)
+            self.created += 1
+        self.acquired += 1
+        self.in_use += 1
+        if self.in_use > self.peak_in_use:
+            self.peak_in_use = self.in_use
+        return obj
+
+    def release(self, obj):
+        """Gives an object back to the pool. It must not be used afterwards."""
+        self.released += 1
+        self.in_use -= 1
+        if self.enabled:
+            self.free.append(obj)
+
+    def release_all(self, objects):
+        """Releases every object in a list and empties the list."""
+        for obj in objects:
+            self.release(obj)
+        objects.clear()
+
+    def stats(self):
+        """Returns the pool's statistics as a dict."""
+        return {
+            'type': self.cls.__name__,
+            'created': self.created,
+            'acquired': self.acquired,
+            'released': self.released,
+            'in_use': self.in_use,
+            'peak_in_use': self.peak_in_use,
+            'free': len(self.free),
+        }
@@ -0,0 +1,159 @@
+import csv
+from collections import deque
+from time import perf_counter_ns
+import pygame
+
+# !!! NEW: Per-subsystem frame profiler
+# Times each part of a frame (event handling, the different update loops, each
+# group of drawing, the display flip and the frame-rate wait) with a
+# high-resolution timer, keeps the last few hundred frames to show rolling
+# averages and 99th percentiles in an overlay, and can write every frame's
+# numbers to a CSV file for later analysis.
+#
+# Code that wants to be timed does:
+#
+#     t = profiler.now()
+#     ...                               # first part
+#     t = profiler.lap('first_part', t)
+#     ...                               # second part
+#     t = profiler.lap('second_part', t)
+#
+# and the main loop calls profiler.end_frame() once per frame. A section that
+# runs several times in one frame (e.g. once per game tick) is added up.
+
+# The sections and counters written to the CSV file, in column order
+SECTIONS = (
+    'events', 'paddle_ball', 'bricks', 'extra_balls', 'power_ups', 'lasers', 'level_up', 'effects',
+    'draw_background', 'draw_objects', 'draw_particles', 'draw_hud', 'flip', 'tick',
+)
+COUNTERS = ('ticks', 'bricks', 'balls', 'power_ups', 'lasers', 'particles', 'fireworks')
+
+class FrameProfiler:
+    def __init__(self, window=300, csv_path=None):
+        """
+        - window: How many recent frames the averages and percentiles cover.
+        - csv_path: A file to write one row of timings per frame to (optional).
+        """
+        self.window = window
+        self.show_overlay = False
+        self.frame = 0
+        # This frame's time per section (nanoseconds) and counter values
+        self.current = {}
+        self.counts = {}
+        # The last `window` frames' time per section (milliseconds), and frame totals
+        self.history = {}
+        self.totals = deque(maxlen=window)
+        self._frame_start = perf_counter_ns()
+
+        self.csv_file = None
+        if csv_path:
+            self.csv_file = open(csv_path, 'w', newline='')
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(['frame', 'total_ms'] + [name + '_ms' for name in SECTIONS] + list(COUNTERS))
+
+    def now(self):
+        """Returns the current time, to pass to lap()."""
+        return perf_counter_ns()
+
+    def lap(self, name, start):
+        """
+        Adds the time since `start` to section `name`.
+        Returns the current time, so the next section can start from it.
+        """
+        end = perf_counter_ns()
+        self.current[name] = self.current.get(name, 0) + end - start
+        return end
+
+    def count(self, name, value):
+        """Records a counter for this frame (e.g. how many particles there are)."""
+        self.counts[name] = value
+
+    def end_frame(self):
+        """Finishes the current frame: stores its numbers and starts the next one."""
+        now = perf_counter_ns()
+        total = (now - self._frame_start) / 1e6
+        self._frame_start = now
+        self.frame += 1
+        self.totals.append(total)
+
+        current = self.current
+        for name in current:
+            if name not in self.history:
+                self.history[name] = deque(maxlen=self.window)
+        # Sections that didn't run this frame took no time
+        for name, values in self.history.items():
+            values.append(current.get(name, 0) / 1e6)
+
+        if self.csv_file is not None:
+            self.csv_writer.writerow(
+                [self.frame, f"{total:.4f}"]
+                + [f"{current.get(name, 0) / 1e6:.4f}" for name in SECTIONS]
+                + [self.counts.get(name, '') for name in COUNTERS])
+        self.current = {}
+        self.counts = {}
+
+    @staticmethod
+    def summarize(values):
+        """Returns (average, 99th percentile) of a list of values."""
+        if not values:
+            return 0.0, 0.0
+        ordered = sorted(values)
+        return sum(ordered) / len(ordered), ordered[int(0.99 * (len(ordered) - 1))]
+
+    def stats(self):
+        """
+        Returns {section: (average ms, p99 ms)} over the recent frames, with the
+        whole frame under 'frame'.
+        """
+        result = {'frame': self.summarize(self.totals)}
+        for name, values in self.history.items():
+            result[name] = self.summarize(values)
+        return result
+
+    def draw_overlay(self, screen, font, text_cache):
+        """
+        Draws the rolling averages and p99 of every section in the top-left corner.
+        Returns the area of the screen that was drawn on.
+        """
+        stats = self.stats()
+        lines = [f"{'section':<16}{'avg ms':>8}{'p99 ms':>8}"]
+        for name in ('frame',) + SECTIONS:
+            if name in stats:
+                average, p99 = stats[name]
+                lines.append(f"{name:<16}{average:8.3f}{p99:8.3f}")
+        line_height = font.get_linesize()
+        surfaces = [text_cache.render(font, line, (0, 255, 0)) for line in lines]
+        width = max(surface.get_width() for surface in surfaces) + 10
+        area = pygame.Rect(0, 0, width, line_height * len(lines) + 10)
+        screen.fill((0, 0, 0), area)
+        for i, surface in enumerate(surfaces):
+            screen.blit(surface, (5, 5 + i * line_height))
+        return area
+
+    def close(self):
+        """Closes the CSV file, if there is one."""
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
+
+class NullProfiler:
+    """
+    A profiler that does nothing, used when profiling is off. It has the same
+    methods as FrameProfiler, so the timed code doesn't need to check.
+    """
+    show_overlay = False
+
+    def now(self):
+        return 0
+
+    def lap(self, name, start):
+        return 0
+
+    def count(self, name, value):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,345 @@
+import pygame
+import threading
+from game_objects import interpolated_rect
+# !!! NEW: Rendered text is cached, so unchanged text isn't rasterized every frame
+from text_cache import shared_cache
+# !!! NEW: Drawing can be timed by the frame profiler
+from profiler import NullProfiler
+
+# !!! PHASE 2: Colors --
+BG_COLOR = pygame.Color('grey12')
+# !!! NEW: How many walls drawn in advance are kept at most. Ones that were never
+# shown (the game was restarted, or a snapshot restored) are dropped oldest first.
+MAX_PREPARED_LAYERS = 4
+
+class BrickLayer:
+    def __init__(self, bricks, screen):
+        """
+        !!! NEW: A cached picture of the brick wall
+        Bricks only change when one breaks, so instead of drawing every brick every
+        frame, the whole wall is drawn once (on the background colour) onto an
+        off-screen surface. Each frame then starts with a single blit of that
+        surface, and when a brick breaks only its rectangle on the surface is
+        painted over.
+        - bricks: The BrickGrid to draw. The layer listens to it for removed bricks.
+        - screen: The surface the layer will be blitted to (its pixel format is used).
+        """
+        self.bricks = bricks
+        self.surface = pygame.Surface(screen.get_size(), 0, screen)
+        self.surface.fill(BG_COLOR)
+        for brick in bricks:
+            pygame.draw.rect(self.surface, bricks.color(brick), bricks.rect(brick))
+        # Areas painted over since the renderer last looked (for dirty-rect mode)
+        self.patched = []
+        bricks.listeners.append(self.remove_brick)
+
+    def remove_brick(self, brick):
+        """Paints a broken brick over with the background."""
+        rect = self.bricks.rect(brick)
+        self.surface.fill(BG_COLOR, rect)
+        self.patched.append(rect)
+
+class Renderer:
+    def __init__(self, screen, dirty_rects=False, text_cache=None):
+        """
+        !!! NEW: Draws a GameSession onto a surface.
+        Keeping the drawing code apart from the game logic means a session can run
+        without a window at all, and anything with a surface (the real window, an
+        off-screen surface) can show it.
+        - screen: The surface to draw on.
+        - dirty_rects: Only redraw (and send to the display) the parts of the screen
+          that changed since the last frame, instead of the whole screen.
+        - text_cache: The TextCache to render text through (the game's shared one if
+          left out).
+        """
+        self.screen = screen
+        self.screen_width, self.screen_height = screen.get_size()
+
+        # !!! NEW: Dirty-rectangle rendering
+        # While playing, most of the screen (the background and the bricks) stays the
+        # same from one frame to the next. In dirty-rect mode we remember every area
+        # the moving things (ball, paddle, power-ups, lasers, particles, HUD text) were
+        # drawn on. Next frame we paint just those areas back to the background (plus
+        # any bricks under them), draw the moving things again, and only send the old
+        # and new areas to the display with pygame.display.update(rects).
+        self.dirty_rects = dirty_rects
+        # What present() should send to the display: a list of rects, or None for all of it
+        self.changed_rects = None
+        # The areas drawn on last frame, the bricks on screen, and what was on screen
+        self._drawn_rects = []
+        self._last_state = None
+        self._last_bricks = None
+        # !!! NEW: The cached picture of the current wall (see BrickLayer), and the
+        # ones made in advance for walls still to come, by BrickGrid (see
+        # prepare_layer). The level thread adds to them while the game thread takes
+        # them out, hence the lock.
+        self.brick_layer = None
+        self.prepared_layers = {}
+        self.prepared_lock = threading.Lock()
+
+        # !!! PHASE 5: Font Setup --
+        # We need a font to display messages on the screen.
+        self.game_font = pygame.font.Font(None, 40)
+        # !!! PHASE 10: Message font for power-up notifications
+        self.message_font = pygame.font.Font(None, 30)
+        # !!! PHASE 12: Title screen font
+        self.title_font = pygame.font.Font(None, 70)
+        self.text_cache = text_cache if text_cache is not None else shared_cache
+
+        # !!! NEW: Set to a FrameProfiler to time each group of drawing. When its
+        # overlay is switched on, the renderer draws it on top of each frame.
+        self.profiler = NullProfiler()
+        self.overlay_font = None
+
+    def draw(self, session, alpha=1.0):
+        """
+        Draws one complete frame of the session.
+        - session: The GameSession to draw.
+        - alpha: How far (0 to 1) the frame is between the session's previous tick
+          and its current one. Moving objects are drawn in between accordingly.
+        """
+        if self.dirty_rects:
+            self.draw_dirty(session, alpha)
+        else:
+            self.changed_rects = None
+            self.draw_full(session, alpha)
+        if self.profiler.show_overlay:
+            self.draw_profiler_overlay()
+
+    def draw_profiler_overlay(self):
+        """!!! NEW: Draws the frame profiler's numbers on top of the frame."""
+        if self.overlay_font is None:
+            self.overlay_font = pygame.font.SysFont('couriernew,dejavusansmono,monospace', 14)
+        area = self.profiler.draw_overlay(self.screen, self.overlay_font, self.text_cache)
+        if self.changed_rects is not None:
+            # In dirty-rect mode: show it now, and paint over it next frame
+            self.changed_rects.append(area)
+            self._drawn_rects.append(area)
+
+    def get_brick_layer(self, bricks):
+        """Returns the cached picture of `bricks`, making a new one for a new wall."""
+        if self.brick_layer is None or self.brick_layer.bricks is not bricks:
+            with self.prepared_lock:
+                layer = self.prepared_layers.pop(bricks, None)
+            if layer is None:
+                layer = BrickLayer(bricks, self.screen)
+            self.brick_layer = layer
+        return self.brick_layer
+
+    def prepare_layer(self, bricks):
+        """
+        !!! NEW: Draws the picture of a wall that will be shown later, so showing it
+        doesn't cost anything. Add it to a session's level_listeners and it is called
+        (on the background thread) with each next level's wall while the current one
+        is played. Each wall keeps its own picture: the level after next can start
+        being prepared before the next one is first drawn.
+        """
+        layer = BrickLayer(bricks, self.screen)
+        with self.prepared_lock:
+            self.prepared_layers[bricks] = layer
+            while len(self.prepared_layers) > MAX_PREPARED_LAYERS:
+                del self.prepared_layers[next(iter(self.prepared_layers))]
+
+    def draw_full(self, session, alpha=1.0):
+        """Draws the whole screen from scratch."""
+        screen = self.screen
+        start = self.profiler.now()
+        if session.game_state == 'playing':
+            # The background and all the bricks in one go
+            layer = self.get_brick_layer(session.bricks)
+            screen.blit(layer.surface, (0, 0))
+            layer.patched.clear()
+        else:
+            screen.fill(BG_COLOR)
+        start = self.profiler.lap('draw_background', start)
+
+        if session.game_state == 'title_screen':
+            self.draw_title_screen(session)
+        elif session.game_state == 'playing':
+            self.draw_playing(session, alpha)
+        elif session.game_state == 'game_over':
+            self.draw_game_over(session)
+        elif session.game_state == 'you_win':
+            self.draw_you_win(session, alpha)
+        if session.game_state != 'playing':
+            self.profiler.lap('draw_hud', start)
+
+    def draw_dirty(self, session, alpha=1.0):
+        """
+        !!! NEW: Draws a frame in dirty-rect mode, redrawing only what changed.
+        """
+        screen = self.screen
+        state = session.game_state
+        # A new screen (state change) or a new level (new wall) is drawn in full
+        new_screen = state != self._last_state or session.bricks is not self._last_bricks
+        self._last_state = state
+        self._last_bricks = session.bricks
+
+        if state != 'playing':
+            # The title and game-over screens don't change, so after their first frame
+            # there is nothing to draw at all. The win screen has moving fireworks,
+            # and the profiler overlay changes every frame.
+            if new_screen or state == 'you_win' or self.profiler.show_overlay:
+                self.draw_full(session, alpha)
+                self.changed_rects = None
+            else:
+                self.changed_rects = []
+            return
+
+        layer = self.get_brick_layer(session.bricks)
+        if new_screen:
+            screen.blit(layer.surface, (0, 0))
+            layer.patched.clear()
+            self._drawn_rects = self.draw_moving(session, alpha)
+            self.changed_rects = None
+            return
+
+        start = self.profiler.now()
+        # Bricks that were broken since last frame have to be painted over too
+        erase = self._drawn_rects + layer.patched
+        layer.patched.clear()
+        # Copying those areas back from the brick layer restores both the background
+        # and any bricks that were underneath
+        for rect in erase:
+            screen.blit(layer.surface, rect, rect)
+        self.profiler.lap('draw_background', start)
+
+        drawn = self.draw_moving(session, alpha)
+        self._drawn_rects = drawn
+        self.changed_rects = erase + drawn
+
+    def present(self):
+        """
+        Shows what was drawn on the display: the whole screen, or in dirty-rect mode
+        only the parts that changed.
+        """
+        if self.changed_rects is None:
+            pygame.display.flip()
+        elif self.changed_rects:
+            pygame.display.update(self.changed_rects)
+
+    def blit_centered(self, font, text, color, center):
+        """Renders a line of text, draws it centered on `center`, and returns its rect."""
+        surface = self.text_cache.render(font, text, color)
+        return self.screen.blit(surface, surface.get_rect(center=center))
+
+    def draw_title_screen(self, session):
+        """
+        !!! PHASE 12: Title Screen Drawing ---
+        !!! NEW: Enhanced title screen with controls
+        """
+        center_x = self.screen_width / 2
+        center_y = self.screen_height / 2
+        # Draw the title
+        self.blit_centered(self.title_font, "ARKANOID", (255, 255, 255), (center_x, center_y - 100))
+        # Draw the start message
+        self.blit_centered(self.game_font, "Press SPACE to Start", (255, 255, 255), (center_x, center_y - 20))
+
+        # Controls information
+        controls = [
+            "Controls:",
+            "Arrow Keys - Move Paddle",
+            "SPACE - Launch Ball / Fire Lasers",
+            "M - Toggle Mute",
+            "",
+            "Endless Mode - How Far Can You Get?" if session.endless else f"Complete {session.max_levels} Levels to Win!"
+        ]
+
+        for i, control in enumerate(controls):
+            color = (255, 255, 0) if i == 0 else (200, 200, 200)  # Yellow for header
+            self.blit_centered(self.message_font, control, color, (center_x, center_y + 40 + i * 25))
+
+    def draw_playing(self, session, alpha=1.0):
+        """
+        Draws the game itself and the HUD on top of it.
+        !!! PHASE 4: The bricks are already on the screen, as part of the brick layer.
+        """
+        self.draw_moving(session, alpha)
+
+    def draw_moving(self, session, alpha=1.0):
+        """
+        Draws everything that can change from one frame to the next while playing:
+        the paddle, ball, power-ups, lasers, effects and the HUD.
+        Returns a list of the screen areas that were drawn on.
+        """
+        screen = self.screen
+        profiler = self.profiler
+        start = profiler.now()
+        rects = []
+        # !!! PHASE 2: We tell the paddle to draw itself to the screen.
+        rects.append(session.paddle.draw(screen, interpolated_rect(session.paddle, alpha)))
+        # !!! PHASE 3: Draw the ball
+        rects.append(session.ball.draw(screen, interpolated_rect(session.ball, alpha)))
+        # !!! NEW: And the extra balls of multi-ball
+        session.extra_balls.draw(screen, alpha, rects)
+
+        # !!! PHASE 7: Draw all power-ups
+        for power_up in session.power_ups:
+            rects.append(power_up.draw(screen, interpolated_rect(power_up, alpha)))
+
+        # !!! PHASE 9: Draw all lasers
+        for laser in session.lasers:
+            rects.append(laser.draw(screen, interpolated_rect(laser, alpha)))
+        start = profiler.lap('draw_objects', start)
+
+        # !!! PHASE 11: Draw particles and fireworks
+        session.particles.draw(screen, alpha, rects)
+
+        for firework in session.fireworks:
+            firework.draw(screen, alpha, rects)
+        start = profiler.lap('draw_particles', start)
+
+        # !!! PHASE 6: Draw Score and Lives ---
+        render = self.text_cache.render
+        score_text = render(self.game_font, f"Score: {session.score}", (255, 255, 255))
+        rects.append(screen.blit(score_text, (10, 10)))
+        lives_text = render(self.game_font, f"Lives: {session.lives}", (255, 255, 255))
+        rects.append(screen.blit(lives_text, (self.screen_width - lives_text.get_width() - 10, 10)))
+
+        # !!! NEW: Display current level and mute status
+        level_text = render(self.game_font, f"Level: {session.current_level}", (255, 255, 255))
+        rects.append(screen.blit(level_text, (self.screen_width // 2 - level_text.get_width() // 2, 10)))
+
+        # Mute indicator
+        if not session.sound_enabled:
+            mute_text = render(self.message_font, "MUTED", (255, 0, 0))
+            rects.append(screen.blit(mute_text, (10, 50)))
+
+        # !!! PHASE 10: Display Power-Up Message ---
+        if session.display_message:
+            rects.append(self.blit_centered(self.message_font, session.display_message, (255, 255, 255), (self.screen_width / 2, 150)))
+        profiler.lap('draw_hud', start)
+        return rects
+
+    def draw_game_over(self, session):
+        """
+        !!! PHASE 5: Draw Game Over Screen ---
+        !!! NEW: Enhanced game over screen
+        """
+        center_x = self.screen_width / 2
+        center_y = self.screen_height / 2
+        self.blit_centered(self.game_font, "GAME OVER", (255, 0, 0), (center_x, center_y - 60))
+        # Show final score and level reached
+        self.blit_centered(self.message_font, f"Final Score: {session.score}", (255, 255, 255), (center_x, center_y - 20))
+        self.blit_centered(self.message_font, f"Level Reached: {session.current_level}", (255, 255, 255), (center_x, center_y + 10))
+        # !!! PHASE 12: Updated restart message
+        self.blit_centered(self.game_font, "Press SPACE to return to Title", (255, 255, 255), (center_x, center_y + 50))
+
+    def draw_you_win(self, session, alpha=1.0):
+        """
+        !!! PHASE 5: Draw You Win Screen ---
+        !!! NEW: Enhanced victory screen
+        """
+        center_x = self.screen_width / 2
+        center_y = self.screen_height / 2
+        self.blit_centered(self.game_font, "CONGRATULATIONS!", (255, 215, 0), (center_x, center_y - 60))  # Gold color
+        self.blit_centered(self.message_font, "All Levels Completed!", (255, 255, 255), (center_x, center_y - 20))
+        # Show final score
+        self.blit_centered(self.message_font, f"Final Score: {session.score}", (255, 255, 255), (center_x, center_y + 10))
+        # !!! PHASE 12: Updated restart message
+        self.blit_centered(self.game_font, "Press SPACE to return to Title", (255, 255, 255), (center_x, center_y + 50))
+
+        # !!! PHASE 11: Draw fireworks on win screen
+        session.particles.draw(self.screen, alpha)
+        for firework in session.fireworks:
+            firework.draw(self.screen, alpha)
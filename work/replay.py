@@ -0,0 +1,163 @@
+# !!! NEW: Input recording and headless replay
+# A game is completely decided by its seed and the controls pressed on each tick
+# (see GameSession), so that's all a recording holds: a small header with the seed,
+# then each tick's input as 4 bits (LEFT, RIGHT, SPACE, M), two ticks to a byte.
+# An hour of play at 60 ticks per second is about 105 KB.
+#
+# Playing a recording back without a window, as fast as the CPU allows, turns a
+# player's bug report into a quick, exact repro case:
+#
+#   python main.py --record bug.rec     # play, then close the window
+#   python replay.py bug.rec            # replays it headless and prints the outcome
+#   python main.py --replay bug.rec     # watch it
+import struct
+import time
+import argparse
+from game_session import GameSession, FrameInput, NO_INPUT, init_headless, MAX_SEED, check_seed
+
+# File header: magic, format version, flags, seed, number of ticks
+MAGIC = b'ARKR'
+VERSION = 1
+HEADER = struct.Struct('<4sBBQI')
+# Header flags: session settings that change how the game plays
+FLAG_SWEPT_COLLISION = 1
+FLAG_ENDLESS = 2
+FLAG_BALL_COLLISIONS = 4
+
+class Recording:
+    def __init__(self, seed, swept_collision=False, frames=None, endless=False, ball_collisions=False):
+        """
+        A recorded game.
+        - seed: The session's seed.
+        - swept_collision: Whether the session always used swept collision.
+        - frames: A bytearray with one input (0-15, see FrameInput.to_bits) per tick.
+        - endless: Whether the session was in endless mode.
+        - ball_collisions: Whether the session's multi-ball balls bounced off each other.
+        Raises ValueError if the seed can't be stored (see MAX_SEED).
+        """
+        check_seed(seed)
+        self.seed = seed
+        self.swept_collision = swept_collision
+        self.endless = endless
+        self.ball_collisions = ball_collisions
+        self.frames = frames if frames is not None else bytearray()
+
+    def __len__(self):
+        return len(self.frames)
+
+    def append(self, inputs):
+        """Adds one tick's FrameInput."""
+        self.frames.append(inputs.to_bits())
+
+    def inputs(self):
+        """Yields every tick's FrameInput in order."""
+        for bits in self.frames:
+            yield FrameInput.from_bits(bits)
+
+    def new_session(self, **kwargs):
+        """Creates a GameSession set up the way the recorded one was."""
+        return GameSession(seed=self.seed, swept_collision=self.swept_collision, endless=self.endless,
+                           ball_collisions=self.ball_collisions, **kwargs)
+
+    def to_bytes(self):
+        """Returns the recording in its binary file format."""
+        frames = self.frames
+        flags = ((FLAG_SWEPT_COLLISION if self.swept_collision else 0) | (FLAG_ENDLESS if self.endless else 0)
+                 | (FLAG_BALL_COLLISIONS if self.ball_collisions else 0))
+        # Two ticks per byte: the even tick in the low 4 bits, the odd one in the high 4
+        odd = frames[1::2] + bytes(len(frames) % 2)
+        packed = bytes(low | (high << 4) for low, high in zip(frames[0::2], odd))
+        return HEADER.pack(MAGIC, VERSION, flags, self.seed, len(frames)) + packed
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Reads a recording back from to_bytes()'s data."""
+        if len(data) < HEADER.size:
+            raise ValueError("Not a recording: too short")
+        magic, version, flags, seed, count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a recording: bad magic")
+        if version != VERSION:
+            raise ValueError(f"Unsupported recording version {version}")
+        packed = data[HEADER.size:]
+        if len(packed) != (count + 1) // 2:
+            raise ValueError("Recording is truncated")
+        frames = bytearray(2 * len(packed))
+        frames[0::2] = bytes(byte & 0x0F for byte in packed)
+        frames[1::2] = bytes(byte >> 4 for byte in packed)
+        del frames[count:]
+        return cls(seed, bool(flags & FLAG_SWEPT_COLLISION), frames, bool(flags & FLAG_ENDLESS),
+                   bool(flags & FLAG_BALL_COLLISIONS))
+
+    def save(self, path):
+        """Writes the recording to a file."""
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Reads a recording from a file."""
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+class RecordingInput:
+    """An input source that passes another one through, recording every tick."""
+    def __init__(self, source, recording):
+        self.source = source
+        self.recording = recording
+
+    def handle_event(self, event):
+        self.source.handle_event(event)
+
+    def next_frame(self):
+        inputs = self.source.next_frame()
+        self.recording.append(inputs)
+        return inputs
+
+class ReplayInput:
+    """An input source that plays a recording back, then gives no input."""
+    def __init__(self, recording):
+        self.recording = recording
+        self.position = 0
+
+    @property
+    def finished(self):
+        return self.position >= len(self.recording)
+
+    def handle_event(self, event):
+        pass # The player's keys are ignored during a replay
+
+    def next_frame(self):
+        if self.finished:
+            return NO_INPUT
+        inputs = FrameInput.from_bits(self.recording.frames[self.position])
+        self.position += 1
+        return inputs
+
+def play(recording):
+    """
+    Replays a recording in a new session, with no window and no frame rate limit.
+    Returns the session as it is after the last recorded tick.
+    """
+    session = recording.new_session()
+    step = session.step
+    for inputs in recording.inputs():
+        step(inputs)
+    return session
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded game without a window")
+    parser.add_argument('recording', help="A file made with main.py --record")
+    args = parser.parse_args()
+
+    init_headless()
+    recording = Recording.load(args.recording)
+    start = time.perf_counter()
+    session = play(recording)
+    elapsed = time.perf_counter() - start
+    print(f"seed {recording.seed}, {len(recording)} ticks replayed in {elapsed:.3f}s "
+          f"({len(recording) / max(elapsed, 1e-9):.0f} ticks/s)")
+    print(f"state={session.game_state} level={session.current_level} score={session.score} lives={session.lives}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+# !!! NEW: Game state snapshots
+# Packs everything that decides how a game carries on (the seed and the session's
+# mode, the paddle and its power-up timers, the ball and any extra balls, the
+# remaining bricks, falling power-ups, lasers, score, lives, level, the message and
+# the gameplay random number generator) into a compact binary blob, and unpacks it
+# back into a session, whatever seed and mode that session was made with.
+# Restoring a snapshot and stepping on gives exactly the same game as the original
+# session would have, so snapshots can be used for rewinding, seeking, crash dumps,
+# or branching lots of what-if games off one moment without replaying from the
+# first frame.
+#
+# Particles and fireworks are only for show and are not saved; restoring clears them.
+import struct
+import numpy as np
+from game_session import POWER_UP_TYPES
+from game_objects import Paddle
+from replay import FLAG_SWEPT_COLLISION, FLAG_ENDLESS, FLAG_BALL_COLLISIONS
+from brick_grid import BrickGrid
+
+MAGIC = b'ARKS'
+VERSION = 8
+
+# The game states, stored by their position in this tuple
+STATES = ('title_screen', 'playing', 'game_over', 'you_win')
+
+# magic, version, frame, state, level, score, lives, lives lost, power-ups collected,
+# sound on, message frames left, message length
+SESSION = struct.Struct('<4sBIBIiiii?iH')
+# The seed, and the settings that change how the game plays as replay.py's header
+# flags (swept collision, endless, ball collisions). Generated levels depend on both.
+SETTINGS = struct.Struct('<QB')
+# rect (x, y, w, h), previous (x, y), width, laser, glue, shield, then the frames
+# left for each of the paddle's power-ups (Paddle.POWER_UPS)
+PADDLE = struct.Struct('<6hh???%di' % len(Paddle.POWER_UPS))
+# position, previous position, speed, glued, slowed, slow frames left, fast, fast frames left
+BALL = struct.Struct('<4hii??i?i')
+# How many extra balls of multi-ball follow, as their x, y, x speed and y speed
+# rows of float64s (see multi_ball.py)
+EXTRA_BALLS = struct.Struct('<H')
+# The brick wall's rows, columns and palette colors. The palette (3 bytes per color)
+# follows, then the grid's color and hits bytes as they are (see brick_grid.py).
+GRID = struct.Struct('<BBB')
+# How many power-ups and lasers follow
+COUNTS = struct.Struct('<HH')
+POWER_UP = struct.Struct('<4hB')      # position, previous position, type
+LASER = struct.Struct('<4h')          # position, previous position
+# random.Random's state: 624 words plus the position within them
+RNG = struct.Struct('<625I')
+
+def save(session):
+    """Returns a snapshot of the session's game state as bytes."""
+    paddle = session.paddle
+    ball = session.ball
+    message = session.display_message.encode('utf-8')
+    parts = [
+        SESSION.pack(MAGIC, VERSION, session.frame, STATES.index(session.game_state), session.current_level,
+                     session.score, session.lives, session.lives_lost, session.power_ups_collected,
+                     session.sound_enabled, session.message_timer, len(message)),
+        SETTINGS.pack(session.seed, (FLAG_SWEPT_COLLISION if session.ball.always_sweep else 0)
+                      | (FLAG_ENDLESS if session.endless else 0)
+                      | (FLAG_BALL_COLLISIONS if session.extra_balls.collide else 0)),
+        message,
+        PADDLE.pack(*paddle.rect, *paddle.prev_topleft, paddle.width, paddle.has_laser, paddle.has_glue,
+                    paddle.has_shield, *[paddle.time_left(type) for type in Paddle.POWER_UPS]),
+        BALL.pack(*ball.rect.topleft, *ball.prev_topleft, ball.speed_x, ball.speed_y, ball.is_glued,
+                  ball.is_slowed, ball.time_left('slow'), ball.is_fast, ball.time_left('fast')),
+        EXTRA_BALLS.pack(len(session.extra_balls)),
+        session.extra_balls.data[:, :len(session.extra_balls)].tobytes(),
+    ]
+    bricks = session.bricks
+    palette = bricks.palette[1:]
+    parts.append(GRID.pack(bricks.rows, bricks.cols, len(palette)))
+    parts.extend(bytes(color) for color in palette)
+    parts += [bytes(bricks.colors), bytes(bricks.hits)]
+    parts.append(COUNTS.pack(len(session.power_ups), len(session.lasers)))
+    type_index = POWER_UP_TYPES.index
+    parts.extend(POWER_UP.pack(*power_up.rect.topleft, *power_up.prev_topleft, type_index(power_up.type))
+                 for power_up in session.power_ups)
+    parts.extend(LASER.pack(*laser.rect.topleft, *laser.prev_topleft) for laser in session.lasers)
+    parts.append(RNG.pack(*session.rng.getstate()[1]))
+    return b''.join(parts)
+
+def restore(session, data):
+    """
+    Puts a session back into the state a snapshot from save() was taken in,
+    including its seed and mode (see GameSession.configure). The session must have
+    the same screen size as the one the snapshot came from.
+    Raises ValueError if `data` is not a snapshot.
+    """
+    if data[:4] != MAGIC:
+        raise ValueError("Not a game snapshot")
+    version = data[4]
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    (_, _, frame, state, level, score, lives, lives_lost, power_ups_collected, sound_enabled, message_timer,
+     message_length) = SESSION.unpack_from(data)
+    offset = SESSION.size
+    seed, flags = SETTINGS.unpack_from(data, offset)
+    offset += SETTINGS.size
+    session.configure(seed, bool(flags & FLAG_SWEPT_COLLISION), bool(flags & FLAG_ENDLESS),
+                      bool(flags & FLAG_BALL_COLLISIONS))
+    session.frame = frame
+    session.game_state = STATES[state]
+    session.current_level = level
+    session.score = score
+    session.lives = lives
+    session.lives_lost = lives_lost
+    session.power_ups_collected = power_ups_collected
+    session.sound_enabled = sound_enabled
+    # The timers are started again below with the time each one had left
+    session.timers.clear()
+    message = data[offset:offset + message_length].decode('utf-8')
+    offset += message_length
+    if message_timer > 0:
+        session.show_message(message, message_timer)
+    else:
+        session.display_message = ""
+
+    paddle = session.paddle
+    values = PADDLE.unpack_from(data, offset)
+    offset += PADDLE.size
+    paddle.rect.update(values[0:4])
+    paddle.prev_topleft = values[4:6]
+    paddle.width, paddle.has_laser, paddle.has_glue, paddle.has_shield = values[6:10]
+    for type, time_left in zip(Paddle.POWER_UPS, values[10:]):
+        if time_left > 0:
+            paddle.start_timer(type, time_left)
+
+    ball = session.ball
+    (x, y, prev_x, prev_y, ball.speed_x, ball.speed_y, ball.is_glued, ball.is_slowed, slow_left,
+     ball.is_fast, fast_left) = BALL.unpack_from(data, offset)
+    offset += BALL.size
+    if slow_left > 0:
+        ball.start_timer('slow', slow_left)
+    if fast_left > 0:
+        ball.start_timer('fast', fast_left)
+    ball.rect.topleft = (x, y)
+    ball.prev_topleft = (prev_x, prev_y)
+    ball.swept_hits = []
+
+    count, = EXTRA_BALLS.unpack_from(data, offset)
+    offset += EXTRA_BALLS.size
+    extra = np.frombuffer(data, dtype=np.float64, count=4 * count, offset=offset).reshape(4, count)
+    session.extra_balls.clear()
+    session.extra_balls.add(extra)
+    offset += extra.nbytes
+
+    rows, cols, color_count = GRID.unpack_from(data, offset)
+    offset += GRID.size
+    palette = [None] + [tuple(data[i:i + 3]) for i in range(offset, offset + 3 * color_count, 3)]
+    offset += 3 * color_count
+    cells = np.frombuffer(data, dtype=np.uint8, count=2 * rows * cols, offset=offset).reshape(2, rows, cols)
+    session.bricks = BrickGrid(cells[0], cells[1], palette)
+    offset += cells.size
+
+    power_up_count, laser_count = COUNTS.unpack_from(data, offset)
+    offset += COUNTS.size
+
+    session.power_up_pool.release_all(session.power_ups)
+    end = offset + power_up_count * POWER_UP.size
+    for x, y, prev_x, prev_y, type in POWER_UP.iter_unpack(data[offset:end]):
+        power_up = session.power_up_pool.acquire(x, y, POWER_UP_TYPES[type])
+        power_up.prev_topleft = (prev_x, prev_y)
+        session.power_ups.append(power_up)
+    offset = end
+
+    session.laser_pool.release_all(session.lasers)
+    end = offset + laser_count * LASER.size
+    for x, y, prev_x, prev_y in LASER.iter_unpack(data[offset:end]):
+        laser = session.laser_pool.acquire(x, y)
+        laser.prev_topleft = (prev_x, prev_y)
+        session.lasers.append(laser)
+    offset = end
+
+    session.rng.setstate((3, RNG.unpack_from(data, offset), None))
+
+    session.particles.clear()
+    session.fireworks.clear()
@@ -0,0 +1,135 @@
+# !!! NEW: Swept (continuous) collision for the ball
+# The normal Ball.update moves the ball a whole frame's worth of pixels in one jump
+# and then checks what it overlaps. If the ball moves further in one frame than the
+# thing it should hit is thick, it can jump straight over it ("tunneling"). Instead
+# of cutting the frame into many tiny steps, we work out *when* during the frame the
+# ball would first touch something, move it exactly there, bounce, and carry on with
+# the rest of the frame - several bounces in a row if needed.
+
+# How many bounces we resolve within a single frame at most
+MAX_BOUNCES = 8
+
+def sweep_rect(x, y, width, height, vx, vy, target):
+    """
+    Sweeps a rect at (x, y) along (vx, vy) against a still `target` rect.
+    Returns (time, axis): the fraction of the movement (0 to 1) at which the two
+    first touch and which axis they touch along ('x' for a side, 'y' for top or
+    bottom), or None if they don't meet during this movement.
+    Rects that already overlap at the start don't count as a hit.
+    """
+    # For each axis: the times at which the rects start and stop overlapping on it
+    if vx > 0:
+        x_entry = (target.left - (x + width)) / vx
+        x_exit = (target.right - x) / vx
+    elif vx < 0:
+        x_entry = (target.right - x) / vx
+        x_exit = (target.left - (x + width)) / vx
+    elif x < target.right and x + width > target.left:
+        x_entry, x_exit = float('-inf'), float('inf')
+    else:
+        return None
+
+    if vy > 0:
+        y_entry = (target.top - (y + height)) / vy
+        y_exit = (target.bottom - y) / vy
+    elif vy < 0:
+        y_entry = (target.bottom - y) / vy
+        y_exit = (target.top - (y + height)) / vy
+    elif y < target.bottom and y + height > target.top:
+        y_entry, y_exit = float('-inf'), float('inf')
+    else:
+        return None
+
+    # They only touch while overlapping on both axes at once
+    entry = max(x_entry, y_entry)
+    exit = min(x_exit, y_exit)
+    # Just sliding along an edge (entry == exit) isn't a collision, same as colliderect
+    if entry >= exit or entry < 0 or entry > 1:
+        return None
+    return entry, 'x' if x_entry > y_entry else 'y'
+
+def move_ball_swept(ball, paddle, bricks):
+    """
+    Moves the ball a whole frame, bouncing off the walls, the paddle and bricks in
+    the order it reaches them.
+    - ball, paddle: The Ball and Paddle objects.
+    - bricks: The BrickGrid of the current level.
+    Returns (collision_object, hit_bricks): the last wall or paddle hit, like
+    Ball.update's collision_object, and the IDs of the bricks hit in order. The
+    bricks are not removed from the grid; that's up to the caller.
+    """
+    collision_object = None
+    hit_bricks = []
+    x, y = float(ball.rect.x), float(ball.rect.y)
+    width, height = ball.rect.width, ball.rect.height
+    screen_width = ball.screen_width
+    time_left = 1.0
+
+    for _ in range(MAX_BOUNCES):
+        vx = ball.speed_x * time_left
+        vy = ball.speed_y * time_left
+        if vx == 0 and vy == 0:
+            break
+        # The earliest hit found so far: (time, axis, what)
+        first = None
+
+        # Walls: the left, right and top edges of the screen
+        if vx < 0 and x + vx <= 0:
+            first = (max(-x / vx, 0.0), 'x', 'wall')
+        elif vx > 0 and x + width + vx >= screen_width:
+            first = (max((screen_width - x - width) / vx, 0.0), 'x', 'wall')
+        if vy < 0 and y + vy <= 0:
+            time = max(-y / vy, 0.0)
+            if first is None or time < first[0]:
+                first = (time, 'y', 'wall')
+
+        # The paddle, only when coming down onto it (as in Ball.update)
+        if vy > 0:
+            hit = sweep_rect(x, y, width, height, vx, vy, paddle.rect)
+            # The paddle moves too: one that slid sideways into a falling ball still
+            # catches it, as Ball.update's overlap check does
+            rect = paddle.rect
+            if hit is None and x < rect.right and x + width > rect.left and y < rect.bottom and y + height > rect.top:
+                hit = (0.0, 'y')
+            if hit is not None and (first is None or hit[0] < first[0]):
+                first = (hit[0], hit[1], 'paddle')
+
+        # Bricks: only the ones in grid cells the ball passes over this frame
+        path = ball.rect.copy()
+        path.topleft = (int(min(x, x + vx)), int(min(y, y + vy)))
+        path.width = int(abs(vx)) + width + 2
+        path.height = int(abs(vy)) + height + 2
+        for brick in bricks.colliding(path):
+            if brick in hit_bricks:
+                continue
+            hit = sweep_rect(x, y, width, height, vx, vy, bricks.rect(brick))
+            if hit is not None and (first is None or hit[0] < first[0]):
+                first = (hit[0], hit[1], brick)
+
+        if first is None:
+            x += vx
+            y += vy
+            break
+
+        # Move to the point of contact and bounce
+        time, axis, what = first
+        x += vx * time
+        y += vy * time
+        time_left *= 1.0 - time
+        if what == 'paddle' and paddle.has_glue:
+            # !!! PHASE 9: Glue Power-Up Logic - the ball stops here
+            ball.is_glued = True
+            collision_object = 'paddle_glue'
+            break
+        # The paddle always sends the ball back up, even off its ends (as in Ball.update)
+        if axis == 'x' and what != 'paddle':
+            ball.speed_x *= -1
+        else:
+            ball.speed_y *= -1
+        if what == 'wall' or what == 'paddle':
+            collision_object = what
+        else:
+            hit_bricks.append(what)
+
+    ball.rect.topleft = (round(x), round(y))
+    return collision_object, hit_bricks
@@ -0,0 +1,64 @@
+# !!! NEW: Checks for swept collision (run with `python -m pytest` in work/)
+import random
+import numpy as np
+from game_objects import Ball, Paddle
+from brick_grid import BrickGrid, CELL_WIDTH, CELL_HEIGHT, GRID_LEFT, GRID_TOP
+from levels import BRICK_WIDTH, BRICK_HEIGHT
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
+GAP_COL = 4
+
+def gap_wall():
+    """
+    Two rows of bricks: the bottom row is full except for a one-brick gap, and the
+    top row only has the brick right behind the gap.
+    """
+    hits = np.zeros((2, 10), dtype=np.uint8)
+    hits[1] = 1
+    hits[1, GAP_COL] = 0
+    hits[0, GAP_COL] = 1
+    return BrickGrid(np.ones_like(hits), hits, [None, (255, 0, 0)])
+
+def fire_through_gap(speed):
+    """
+    Sends a ball straight up through the gap at `speed` pixels a frame. Returns the
+    ball and the IDs of the bricks it hit, in order.
+    """
+    bricks = gap_wall()
+    paddle = Paddle(SCREEN_WIDTH, SCREEN_HEIGHT)
+    ball = Ball(SCREEN_WIDTH, SCREEN_HEIGHT, rng=random.Random(0))
+    ball.rect.centerx = GRID_LEFT + GAP_COL * CELL_WIDTH + BRICK_WIDTH // 2
+    ball.rect.top = GRID_TOP + 2 * CELL_HEIGHT + 40
+    ball.speed_x, ball.speed_y = 0, -speed
+    hits = []
+    for _ in range(20):
+        ball.update(paddle, bricks=bricks)
+        hits += ball.swept_hits
+        if hits:
+            break
+    return ball, hits
+
+def test_only_balls_that_can_tunnel_are_swept():
+    ball = Ball(SCREEN_WIDTH, SCREEN_HEIGHT, rng=random.Random(0))
+    # Every speed the game uses stays on the simple overlap check
+    assert not ball.needs_sweep()
+    ball.apply_fast()
+    assert not ball.needs_sweep()
+    ball.reset()
+    ball.apply_slow()
+    assert not ball.needs_sweep()
+    # Fast enough to jump over the paddle in one frame
+    ball.speed_y = -(Paddle.HEIGHT + ball.radius * 2)
+    assert ball.needs_sweep()
+    ball.reset()
+    ball.always_sweep = True
+    assert ball.needs_sweep()
+
+def test_fast_ball_hits_the_brick_behind_a_gap():
+    # Much faster than a brick is thick, so it has to be swept
+    for speed in (45, 90):
+        ball, hits = fire_through_gap(speed)
+        assert hits == [GAP_COL], speed
+        # It bounced back down from the brick's bottom edge, not from inside it
+        assert ball.speed_y > 0
+        assert ball.rect.top >= GRID_TOP + BRICK_HEIGHT - 1
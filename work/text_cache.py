@@ -0,0 +1,43 @@
+from collections import OrderedDict
+
+# !!! NEW: Text render cache
+# font.render() has to rasterize every letter, which makes it one of the most
+# expensive calls in a frame, yet most of the text on screen ("Lives: 3", the
+# power-up letters, the whole title screen) is exactly the same as last frame.
+# The cache keeps the surfaces it has rendered, keyed by font, text and color, and
+# hands back the same surface next time. Text that changes, like the score, simply
+# gets a new entry when its value changes. The least recently used entries are
+# thrown away once the cache is full.
+
+class TextCache:
+    def __init__(self, max_size=256):
+        """
+        - max_size: How many rendered surfaces to keep at most.
+        """
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Same as font.render(text, antialias, color), but cached."""
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            # Forget the entry that was used longest ago
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Forgets every rendered surface."""
+        self.surfaces.clear()
+
+# The cache shared by everything that draws text in the game
+shared_cache = TextCache()
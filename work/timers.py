@@ -0,0 +1,70 @@
+# !!! NEW: Timed effects
+# Power-ups, the slow and fast ball and on-screen messages all last a number of
+# ticks and then have to be undone. Instead of every object counting down each of
+# its timers on every tick, they all go into one queue ordered by when they run
+# out (a min-heap). Each tick only looks at the front of the queue, so a tick
+# where nothing runs out costs the same however many timers are running, and a
+# new kind of timed effect doesn't add another countdown to every frame.
+import heapq
+import itertools
+
+class TimerQueue:
+    def __init__(self):
+        # Ticks counted so far
+        self.now = 0
+        # [expiry tick, order scheduled, key, callback] lists, soonest first. A
+        # cancelled or restarted timer's entry stays in the heap with its callback
+        # set to None, and is skipped when it comes to the front.
+        self.heap = []
+        # The live entry for each key
+        self.entries = {}
+        self.order = itertools.count()
+
+    def schedule(self, key, delay, callback):
+        """
+        Calls `callback()` in `delay` ticks. A timer with the same key that is
+        still running is replaced, so restarting an effect just moves its end.
+        - key: Names the timer (any hashable value), for remaining() and cancel().
+        """
+        self.cancel(key)
+        entry = [self.now + delay, next(self.order), key, callback]
+        self.entries[key] = entry
+        heapq.heappush(self.heap, entry)
+        # Don't let timers that were restarted over and over pile up in the heap.
+        # The heap is compacted in place: advance() may be looping over it right now,
+        # if a callback is what scheduled this timer.
+        if len(self.heap) > 2 * len(self.entries) + 32:
+            self.heap[:] = [entry for entry in self.heap if entry[3] is not None]
+            heapq.heapify(self.heap)
+
+    def cancel(self, key):
+        """Stops a timer without calling its callback. Does nothing if it isn't running."""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            entry[3] = None
+
+    def clear(self):
+        """Stops every timer, without calling any callbacks."""
+        self.heap.clear()
+        self.entries.clear()
+
+    def remaining(self, key):
+        """How many ticks until a timer runs out (0 if it isn't running)."""
+        entry = self.entries.get(key)
+        return entry[0] - self.now if entry is not None else 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def advance(self):
+        """Counts one tick and calls the callbacks of the timers that ran out, in order."""
+        self.now += 1
+        heap = self.heap
+        while heap and heap[0][0] <= self.now:
+            _, _, key, callback = heapq.heappop(heap)
+            if callback is not None:
+                del self.entries[key]
+                callback()
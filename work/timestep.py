@@ -0,0 +1,31 @@
+from game_session import TICK_RATE
+
+class FixedTimestep:
+    def __init__(self, tick_rate=TICK_RATE, max_frame_time=0.25):
+        """
+        !!! NEW: Fixed-timestep accumulator
+        Turns real elapsed time into a whole number of game ticks. Time that is left
+        over (less than one tick) is carried over to the next frame, and `alpha` says
+        how far into the next tick we are, which the renderer uses to interpolate.
+        - tick_rate: Game ticks per second.
+        - max_frame_time: Longest real time (seconds) a single frame may account for.
+          After a long stall (window dragged, debugger break) we skip ahead instead
+          of trying to catch up on hundreds of ticks at once.
+        """
+        self.tick_seconds = 1.0 / tick_rate
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+
+    def advance(self, elapsed):
+        """
+        Adds `elapsed` seconds of real time and returns how many ticks to run now.
+        """
+        self.accumulator += min(elapsed, self.max_frame_time)
+        ticks = int(self.accumulator / self.tick_seconds)
+        self.accumulator -= ticks * self.tick_seconds
+        return ticks
+
+    @property
+    def alpha(self):
+        """How far (0 to 1) we are between the last tick and the next one."""
+        return self.accumulator / self.tick_seconds
@@ -0,0 +1,127 @@
+# !!! NEW: Multi-core tournament runner
+# Plays many seeded headless games with a bot, spread over a pool of worker
+# processes, and sums up how they went. Good for checking whether a gameplay
+# tweak (say, a different power-up drop rate) changes anything beyond noise:
+#
+#   python tournament.py --bot autopilot --games 2000
+#   python tournament.py --bot autopilot --games 2000 --drop-rate 0.3 --json tweak.json
+#
+# Each worker process imports the game and initializes pygame once, then plays
+# game after game; only the seeds go out and small summary dicts come back.
+import os
+import json
+import time
+import argparse
+import multiprocessing
+import numpy as np
+from game_session import GameSession, FrameInput, POWER_UP_CHANCE, POWER_UP_DURATION, init_headless
+from bots import BOTS
+
+# The per-game numbers that get percentiles in the summary
+METRICS = ('score', 'level', 'frames', 'lives_lost', 'power_ups_collected')
+PERCENTILES = (5, 25, 50, 75, 95)
+
+def init_worker():
+    """Runs once in every worker process, before its first game."""
+    # SDL normally turns SIGTERM into a quit event instead of exiting, which would
+    # leave the pool waiting forever for its workers to stop
+    os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+    init_headless()
+
+def play_game(task):
+    """
+    Plays one game to the end (or until max_frames ticks) and returns its summary.
+    - task: A (bot name, seed, max_frames, session settings) tuple.
+    """
+    bot_name, seed, max_frames, settings = task
+    session = GameSession(seed=seed, **settings)
+    bot = BOTS[bot_name](session, seed)
+    step = session.step
+    next_frame = bot.next_frame
+    # Leave the title screen, then play until the game is over or won
+    step(FrameInput(space=True))
+    while session.game_state == 'playing' and session.frame < max_frames:
+        step(next_frame())
+    return {
+        'seed': seed,
+        'score': session.score,
+        'level': session.current_level,
+        'frames': session.frame,
+        'lives_lost': session.lives_lost,
+        'power_ups_collected': session.power_ups_collected,
+        'result': session.game_state,
+    }
+
+def run(bot_name, seeds, max_frames, settings, workers):
+    """Plays a game for every seed and returns the summaries, in seed order."""
+    tasks = [(bot_name, seed, max_frames, settings) for seed in seeds]
+    if workers <= 1:
+        init_worker()
+        return [play_game(task) for task in tasks]
+    with multiprocessing.Pool(workers, initializer=init_worker) as pool:
+        # Several games per message between processes, but small enough chunks
+        # that all workers stay busy until the end
+        chunksize = max(1, len(tasks) // (workers * 8))
+        return pool.map(play_game, tasks, chunksize)
+
+def summarize(results):
+    """Returns aggregate statistics over the game summaries."""
+    summary = {'games': len(results)}
+    for name in METRICS:
+        values = np.array([result[name] for result in results], dtype=np.float64)
+        summary[name] = {
+            'mean': float(values.mean()),
+            'std': float(values.std()),
+            'min': float(values.min()),
+            'max': float(values.max()),
+            **{f"p{p}": float(value) for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+        }
+    for result in ('you_win', 'game_over', 'playing'):
+        summary[result] = sum(1 for game in results if game['result'] == result)
+    return summary
+
+def report(summary, elapsed, total_frames):
+    """Prints the summary as a table."""
+    print(f"{summary['games']} games, {total_frames} frames in {elapsed:.1f}s "
+          f"({total_frames / elapsed:,.0f} frames/s)")
+    print(f"won {summary['you_win']}, lost {summary['game_over']}, unfinished {summary['playing']}")
+    print(f"{'':>20}{'mean':>10}" + ''.join(f"{'p' + str(p):>10}" for p in PERCENTILES))
+    for name in METRICS:
+        stats = summary[name]
+        print(f"{name:>20}{stats['mean']:10.1f}" + ''.join(f"{stats['p' + str(p)]:10.1f}" for p in PERCENTILES))
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many headless games with a bot across all CPU cores")
+    parser.add_argument('--bot', choices=sorted(BOTS), default='autopilot', help="Which bot plays")
+    parser.add_argument('--games', type=int, default=1000, help="How many games to play")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the first game (the rest count up)")
+    parser.add_argument('--max-frames', type=int, default=60 * 60 * 10, help="Give up on a game after this many ticks")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes (1 runs in this process)")
+    parser.add_argument('--drop-rate', type=float, default=POWER_UP_CHANCE, help="Chance that a broken brick drops a power-up")
+    parser.add_argument('--power-up-duration', type=int, default=POWER_UP_DURATION, help="How many ticks power-ups last")
+    parser.add_argument('--swept', action='store_true', help="Always use swept collision for the ball")
+    parser.add_argument('--endless', action='store_true', help="Play generated levels after the last one")
+    parser.add_argument('--ball-collisions', action='store_true', help="Let the balls of multi-ball bounce off each other")
+    parser.add_argument('--json', metavar='FILE', help="Write every game's summary and the aggregates to a JSON file")
+    args = parser.parse_args()
+
+    settings = {
+        'power_up_chance': args.drop_rate,
+        'power_up_duration': args.power_up_duration,
+        'swept_collision': args.swept,
+        'endless': args.endless,
+        'ball_collisions': args.ball_collisions,
+    }
+    seeds = range(args.seed, args.seed + args.games)
+    start = time.perf_counter()
+    results = run(args.bot, seeds, args.max_frames, settings, args.workers)
+    elapsed = time.perf_counter() - start
+    summary = summarize(results)
+    report(summary, elapsed, sum(result['frames'] for result in results))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'bot': args.bot, 'settings': settings, 'summary': summary, 'games': results}, f, indent=1)
+
+if __name__ == '__main__':
+    main()